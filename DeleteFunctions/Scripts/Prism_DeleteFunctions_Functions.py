@@ -42,15 +42,32 @@
 
 
 import os
+import errno
+import glob
+import ctypes
+import socket
 import ntpath
 import subprocess
 import json
 import shutil
 import re
+import tarfile
+import time
+import heapq
+import bisect
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from functools import partial
 
+#   sqlite3 is not available in every DCC's Python
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
 from qtpy.QtCore import *
 from qtpy.QtGui import *
 from qtpy.QtWidgets import *
@@ -61,6 +78,230 @@ from PrismUtils.Decorators import err_catcher_plugin as err_catcher
 logger = logging.getLogger(__name__)
 
 
+#   Format of the "Deleted" timestamps written before "DeletedTime" was added
+LEGACY_TIME_FORMAT = "%m/%d/%y %H:%M"
+
+#   Name of the trash root Dir made in each export location when using Trash on each Volume
+VOLUME_TRASH_NAME = ".prism_trash"
+
+#   Crockford base32 alphabet used for UIDs
+UID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+UID_LENGTH = 26
+
+#   Last (milliseconds, random) issued, so UIDs in the same millisecond stay ordered
+_lastUID = [0, 0]
+_uidLock = threading.Lock()
+
+
+def getDeletedTime(item):
+    #   Returns the deletion time of a Ledger item in epoch seconds
+    deletedTime = item.get("DeletedTime")
+    if deletedTime is not None:
+        return deletedTime
+
+    #   Items that have not been migrated yet
+    try:
+        return datetime.strptime(item["Deleted"], LEGACY_TIME_FORMAT).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return getUIDTime(item.get("UID")) or 0.0
+
+
+def getItemPath(item):
+    #   Returns the path that holds a Deleted item in the Delete Dir - its Dir, or its archive
+    return item.get("Archive") or item["DeletedLocation"]
+
+
+def getItemPaths(item):
+    #   Returns every path that holds a Deleted item, including its Dirs in the Volume Trash roots
+    return [getItemPath(item)] + item.get("VolumeDirs", [])
+
+
+def getLocationDir(item, origItem):
+    #   Returns the Dir holding the files deleted from one location
+    return origItem.get("trashPath") or os.path.join(item["DeletedLocation"], origItem["location"])
+
+
+def generateUID(timestamp=None):
+    #   ULID-style UID: 48 bit milliseconds followed by 80 random bits, as 26 base32 characters.
+    #   UIDs sort by time, so they can be used as keys for time-range scans
+    if timestamp is None:
+        timestamp = time.time()
+    millis = int(timestamp * 1000) & (2**48 - 1)
+
+    with _uidLock:
+        #   Increments the random part for UIDs in the same millisecond
+        if millis == _lastUID[0] and _lastUID[1] < 2**80 - 1:
+            randomBits = _lastUID[1] + 1
+        else:
+            randomBits = int.from_bytes(os.urandom(10), "big")
+
+        if millis >= _lastUID[0]:
+            _lastUID[0], _lastUID[1] = millis, randomBits
+
+    value = (millis << 80) | randomBits
+    chars = []
+    for _ in range(UID_LENGTH):
+        chars.append(UID_ALPHABET[value & 31])
+        value >>= 5
+
+    return "".join(reversed(chars))
+
+
+def getUIDTime(UID):
+    #   Returns the epoch seconds of a ULID-style UID, or None for the older timestamp UIDs
+    if not isinstance(UID, str) or len(UID) != UID_LENGTH:
+        return None
+
+    millis = 0
+    for char in UID[:10]:
+        index = UID_ALPHABET.find(char)
+        if index < 0:
+            return None
+        millis = (millis << 5) | index
+
+    return millis / 1000
+
+
+def formatDeletedTime(deletedTime):
+    #   ISO 8601 string shown in the table
+    return datetime.fromtimestamp(deletedTime).isoformat(sep=" ", timespec="seconds")
+
+
+def measurePath(path):
+    #   Returns the (bytes, number of files) of a file or Dir
+    try:
+        if os.path.islink(path) or not os.path.isdir(path):
+            return os.lstat(path).st_size, 1
+    except OSError:
+        return 0, 0
+
+    totalSize = 0
+    fileCount = 0
+    dirStack = [path]
+
+    while dirStack:
+        try:
+            entries = os.scandir(dirStack.pop())
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirStack.append(entry.path)
+                    else:
+                        totalSize += entry.stat(follow_symlinks=False).st_size
+                        fileCount += 1
+                except OSError:
+                    pass
+
+    return totalSize, fileCount
+
+
+def hashFile(path, bufferSize=1024 * 1024):
+    #   Streaming blake2b hash of a file, read into a reused buffer
+    fileHash = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(bufferSize)
+    view = memoryview(buffer)
+
+    with open(path, "rb", buffering=0) as file:
+        while True:
+            numRead = file.readinto(buffer)
+            if not numRead:
+                break
+            fileHash.update(view[:numRead])
+
+    return fileHash.hexdigest()
+
+
+def linkFile(source, dest):
+    #   Replaces dest with a hardlink to source.  Returns False if it cannot be linked
+    tmpPath = dest + ".dflink"
+    try:
+        os.link(source, tmpPath)
+        os.replace(tmpPath, dest)
+        return True
+    except OSError:
+        try:
+            os.remove(tmpPath)
+        except OSError:
+            pass
+        return False
+
+
+def breakHardlink(path):
+    #   Gives a restored file its own copy if it still shares its data with the Delete Dir
+    if os.stat(path).st_nlink > 1:
+        tmpPath = path + ".dfcopy"
+        shutil.copy2(path, tmpPath)
+        os.replace(tmpPath, path)
+
+
+def isProcessRunning(pid):
+    #   os.kill(pid, 0) would terminate the process on Windows
+    if os.name == "nt":
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)     #   PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exitCode = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exitCode))
+        kernel32.CloseHandle(handle)
+        return exitCode.value == 259                          #   STILL_ACTIVE
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def writeJsonAtomic(path, data, backups=0):
+    #   Writes to a temp file and replaces the original, so a crash never leaves a partial file
+    tmpPath = f"{path}.{os.getpid()}.tmp"
+    with open(tmpPath, "w") as json_file:
+        json.dump(data, json_file, indent=4)
+        json_file.flush()
+        os.fsync(json_file.fileno())
+
+    #   Rotates the backups, .bak1 is the newest
+    if backups and os.path.exists(path):
+        for num in range(backups - 1, 0, -1):
+            if os.path.exists(f"{path}.bak{num}"):
+                os.replace(f"{path}.bak{num}", f"{path}.bak{num + 1}")
+        shutil.copy2(path, f"{path}.bak1")
+
+    os.replace(tmpPath, path)
+
+
+def isValidSettingsFile(path):
+    try:
+        with open(path, "r") as json_file:
+            data = json.load(json_file)
+    except (OSError, ValueError):
+        return False
+
+    return isinstance(data, dict) and "Delete Active" in data
+
+
+def formatSize(totalSize):
+    # Convert bytes to appropriate unit and round to the nearest tenth
+    if totalSize < 1024 * 1024:
+        size = round(totalSize / 1024, 1)
+        unit = "KB"
+    elif totalSize >= 1024**3:
+        size = round(totalSize / (1024**3), 1)
+        unit = "GB"
+    else:
+        size = round(totalSize / (1024 * 1024), 1)
+        unit = "MB"
+
+    return f"{size} {unit}"
+
+
 class Prism_DeleteFunctions_Functions(object):
     def __init__(self, core, plugin):
         self.core = core
@@ -68,17 +309,80 @@ class Prism_DeleteFunctions_Functions(object):
 
         self.pluginDir = os.path.dirname(os.path.dirname(__file__))
         self.settingsFile = os.path.join(self.pluginDir, "DeleteFunctions_Config.json")
+        self.journalFile = os.path.join(self.pluginDir, "DeleteFunctions_Journal.jsonl")
+        self.ledgerDbFile = os.path.join(self.pluginDir, "DeleteFunctions_Ledger.db")
+        #   Journals of deletes in progress, one file for each delete
+        self.transactionDir = os.path.join(self.pluginDir, "DeleteFunctions_Transactions")
+        #   Number of rotated copies of the settings file kept
+        self.settingsBackups = 3
 
         self.loadedPlugins = []
         self.delDirectory = None
         self.deleteActive = False
-        self.delFileInfoList = []
+        #   Size limit of the Delete Dir in GB (0 is unlimited), and which items are evicted first
+        self.deleteQuota = 0
+        self.quotaPolicy = "Oldest"
+        #   Identical files in the Delete Dir are hardlinked to a single copy
+        self.dedupFiles = False
+        #   Items older than the hours (0 is off) are packed into a compressed archive
+        self.archiveAfter = 0
+        self.archiveFormat = "gzip"
+        #   Files on another volume are moved to a trash root on that volume instead of copied
+        self.volumeTrash = False
+        #   Extra trash roots, used for the volumes they are on
+        self.trashRoots = []
+
+        #   Holds the parsed settings file until it changes on disk
+        self.settingsCache = SettingsCache(self.settingsFile)
+        #   Saves made within the delay are written to the settings file once
+        self.saveTimer = QTimer()
+        self.saveTimer.setSingleShot(True)
+        self.saveTimer.setInterval(500)     #   milliseconds
+        self.saveTimer.timeout.connect(lambda: self.writeSettings())
+        #   Set if a pending save came from the settings UI, which is refreshed after the write
+        self.saveUpdatesUI = False
+        #   Writes a pending save before Prism closes
+        QCoreApplication.instance().aboutToQuit.connect(self.flushSettings)
+        #   Deleted items - snapshot in the settings file plus the append-only journal,
+        #   or the optional SQLite index
+        self.ledgerBackend = "JSON"
+        self.ledger = DeleteLedger(self.journalFile, settingsFile=self.settingsFile)
+        #   Highest _# suffix of each Deleted item name, used by ensureDirName
+        self.dirNameCounters = None
+
+        #   File operations are run off the GUI thread
+        self.threadPool = QThreadPool()
+        self.activeJobs = []
+        self.moveEngine = MoveEngine()
+
+        #   Delete Dir scan results keyed by item path, reused while the item Dir is unchanged
+        self.scanCache = {}
+        self.scanRunning = False
+
+        #   Scene File Dir listings indexed by version, reused until the Dir changes
+        self.versionIndex = SceneVersionIndex()
+
+        #   Export locations are probed in parallel with a timeout, so an offline server does not block
+        self.locationProber = LocationProber()
+
+        #   UIDs of items currently being purged, restored or archived
+        self.purgingUIDs = set()
+        self.restoringUIDs = set()
+        self.archivingUIDs = set()
+
+        #   Checks the Delete Dir in the background, menus read the cached status
+        self.dirMonitor = DeleteDirMonitor()
+        self.dirMonitor.signals.result.connect(lambda status: self.configureUI())
 
         self.loadSettings()
+        self.dirMonitor.start()
+
+        #   Rolls back or resumes deletes that were interrupted
+        self.recoverTransactions()
 
         #   Creates autoPurger timer instance if called from Prism Standalone
         if self.core.appPlugin.pluginName == "Standalone":
-            self.autoPurger = AutoPurger(self.core, self.settingsFile, self.delDirectory)
+            self.autoPurger = AutoPurger(self.core, self)
             self.updateAutoPurger(mode="launch")
 
         #   Callbacks
@@ -105,7 +409,8 @@ class Prism_DeleteFunctions_Functions(object):
 
     @err_catcher(name=__name__)
     def isDeleteActive(self):
-        if os.path.exists(self.delDirectory) and self.deleteActive:
+        status = self.dirMonitor.getStatus()
+        if self.deleteActive and status.get("exists") and status.get("writable"):
             return True
         else:
             return False
@@ -153,7 +458,38 @@ class Prism_DeleteFunctions_Functions(object):
             )
         self.chb_usedelete.setToolTip(tip)
 
+        self.chb_useSqlite = QCheckBox()
+        self.chb_useSqlite.setText("Use SQLite Index")
+        tip = ("Keeps the list of Deleted items in an indexed SQLite database\n"
+               "instead of the settings file.\n"
+               "\n"
+               "Recommended when holding a large number of Deleted items."
+               )
+        self.chb_useSqlite.setToolTip(tip)
+
+        self.chb_dedup = QCheckBox()
+        self.chb_dedup.setText("Deduplicate Files")
+        tip = ("Files identical to a file already in the Delete Dir are stored as\n"
+               "hardlinks to it, so repeated copies do not use extra space.\n"
+               "\n"
+               "The Delete Dir volume must support hardlinks."
+               )
+        self.chb_dedup.setToolTip(tip)
+
         self.lo_useDeleteBox.addWidget(self.chb_usedelete, 0, 0)
+        self.lo_useDeleteBox.addWidget(self.chb_useSqlite, 0, 1)
+        self.chb_volumeTrash = QCheckBox()
+        self.chb_volumeTrash.setText("Trash on each Volume")
+        tip = ("Files on a different volume than the Delete Dir are moved to a\n"
+               f"hidden {VOLUME_TRASH_NAME} Dir in their export location, so large\n"
+               "deletes are a rename instead of a copy.\n"
+               "\n"
+               "Additional trash roots can be added to \"Trash Roots\" in the settings file."
+               )
+        self.chb_volumeTrash.setToolTip(tip)
+
+        self.lo_useDeleteBox.addWidget(self.chb_dedup, 0, 2)
+        self.lo_useDeleteBox.addWidget(self.chb_volumeTrash, 0, 3)
         self.lo_deleteDirectory.addLayout(self.lo_useDeleteBox)
 
         # Add a spacer to separate the top and bottom sections
@@ -218,26 +554,102 @@ class Prism_DeleteFunctions_Functions(object):
         # Add the hours box layout to the QVBoxLayout
         self.lo_deleteDirectory.addLayout(self.lo_hoursBox)
 
+        # Add a box for the Delete Dir size quota
+        self.lo_quotaBox = QGridLayout()
+
+        self.l_quota = QLabel("Delete Dir Quota in GB")
+        self.spb_quota = QSpinBox()
+        self.spb_quota.setRange(0, 100000)
+        tip = ("Maximum size of the Delete Dir.  When a Delete goes over the quota,\n"
+               "Deleted items are purged until the Delete Dir is back under the quota.\n"
+               "\n"
+               "Setting Zero will disable the quota."
+               )
+        self.spb_quota.setToolTip(tip)
+
+        self.l_quotaPolicy = QLabel("Purge First")
+        self.cb_quotaPolicy = QComboBox()
+        self.cb_quotaPolicy.addItems(["Oldest", "Largest"])
+        tip = "Which Deleted items are purged first when the quota is reached."
+        self.cb_quotaPolicy.setToolTip(tip)
+
+        self.hotzSpacer2 = QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum)
+
+        self.lo_quotaBox.addWidget(self.l_quota, 0, 0)
+        self.lo_quotaBox.addWidget(self.spb_quota, 0, 1)
+        self.lo_quotaBox.addItem(self.hotzSpacer2, 0, 2)
+        self.lo_quotaBox.addWidget(self.l_quotaPolicy, 0, 3)
+        self.lo_quotaBox.addWidget(self.cb_quotaPolicy, 0, 4)
+
+        self.lo_deleteDirectory.addLayout(self.lo_quotaBox)
+
+        # Add a box for the archive tier
+        self.lo_archiveBox = QGridLayout()
+
+        self.l_archive = QLabel("Archive Items after Hours")
+        self.spb_archive = QSpinBox()
+        self.spb_archive.setRange(0, 720)
+        tip = ("Deleted items older than this are packed into a single compressed\n"
+               "archive in the Delete Dir.  Archived items are extracted when restored.\n"
+               "\n"
+               "Setting Zero will disable archiving.\n"
+               "Archiving is run by Prism Standalone."
+               )
+        self.spb_archive.setToolTip(tip)
+
+        self.l_archiveFormat = QLabel("Compression")
+        self.cb_archiveFormat = QComboBox()
+        self.cb_archiveFormat.addItems(list(ArchiveWorker.formats))
+        tip = "gzip is faster, xz makes smaller archives."
+        self.cb_archiveFormat.setToolTip(tip)
+
+        self.hotzSpacer3 = QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum)
+
+        self.lo_archiveBox.addWidget(self.l_archive, 0, 0)
+        self.lo_archiveBox.addWidget(self.spb_archive, 0, 1)
+        self.lo_archiveBox.addItem(self.hotzSpacer3, 0, 2)
+        self.lo_archiveBox.addWidget(self.l_archiveFormat, 0, 3)
+        self.lo_archiveBox.addWidget(self.cb_archiveFormat, 0, 4)
+
+        self.lo_deleteDirectory.addLayout(self.lo_archiveBox)
+
+        #   Filter for the table
+        self.e_filterItems = QLineEdit()
+        self.e_filterItems.setPlaceholderText("Filter Deleted items..")
+        tip = "Shows only the Deleted items matching the text."
+        self.e_filterItems.setToolTip(tip)
+
+        self.chb_currentProject = QCheckBox()
+        self.chb_currentProject.setText("Current Project Only")
+        tip = "Shows only the items Deleted from the current Project."
+        self.chb_currentProject.setToolTip(tip)
+
+        self.lo_filterBox = QHBoxLayout()
+        self.lo_filterBox.addWidget(self.e_filterItems)
+        self.lo_filterBox.addWidget(self.chb_currentProject)
+        self.lo_deleteDirectory.addLayout(self.lo_filterBox)
+
+        #   Model over the Ledger.  Rows are fetched in pages as the table is scrolled
+        self.itemsModel = DeletedItemsModel()
+        self.itemsProxy = QSortFilterProxyModel()
+        self.itemsProxy.setSourceModel(self.itemsModel)
+        self.itemsProxy.setSortRole(Qt.UserRole)
+        self.itemsProxy.setFilterKeyColumn(-1)
+        self.itemsProxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+
         # Add the table directly to the layout
-        self.table_delItems = QTableWidget()
-        self.table_delItems.setColumnCount(5)  # Set the number of columns
-        self.table_delItems.setHorizontalHeaderLabels(["Project", "Type", "Entity", "Deleted"])  # Set column headers
+        self.table_delItems = QTableView()
+        self.table_delItems.setModel(self.itemsProxy)
+        self.table_delItems.verticalHeader().setVisible(False)
 
         # # Set column widths
         self.table_delItems.setColumnWidth(0, 150)      # Project column
         self.table_delItems.setColumnWidth(1, 100)      # Type column
-        # self.table_delItems.setColumnWidth(1, -1)     # File column (stretch to fill)
         self.table_delItems.setColumnWidth(3, 150)      # Deleted column
 
         # Set column stretch
         self.table_delItems.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)  # File column (stretch to fill)
 
-        # Set column alignments
-        self.table_delItems.horizontalHeaderItem(0).setTextAlignment(Qt.AlignLeft)  # Project column (left-align)
-        self.table_delItems.horizontalHeaderItem(1).setTextAlignment(Qt.AlignLeft)  # Type column (center-align)
-        self.table_delItems.horizontalHeaderItem(2).setTextAlignment(Qt.AlignLeft)  # File column (center-align)
-        self.table_delItems.horizontalHeaderItem(3).setTextAlignment(Qt.AlignLeft)  # Deleted column (right-align)
-
         #   Hides UID Column
         self.table_delItems.setColumnHidden(4, True)
 
@@ -250,11 +662,19 @@ class Prism_DeleteFunctions_Functions(object):
 
         #   Configure Table
         self.table_delItems.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table_delItems.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table_delItems.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table_delItems.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_delItems.setSortingEnabled(True)
+        self.table_delItems.sortByColumn(3, Qt.DescendingOrder)  # Default sorting by "Deleted" column, descending order
 
         self.lo_deleteDirectory.addWidget(self.table_delItems)
 
+        #   Shown in place of the table if the Delete Dir is not found
+        self.l_tableMessage = QLabel("DELETE DIRECTORY DOES NOT EXIST.")
+        self.l_tableMessage.setAlignment(Qt.AlignCenter)
+        self.l_tableMessage.setVisible(False)
+        self.lo_deleteDirectory.addWidget(self.l_tableMessage)
+
         # Add a box for buttons at the bottom
         self.lo_buttonBox = QHBoxLayout()
 
@@ -297,7 +717,6 @@ class Prism_DeleteFunctions_Functions(object):
 
         self.connections()
         self.loadSettings()
-        self.calcDelDirSize()
 
 
     @err_catcher(name=__name__)
@@ -306,25 +725,38 @@ class Prism_DeleteFunctions_Functions(object):
         try:
             self.deleteActive = self.chb_usedelete.isChecked()
             enabled = self.deleteActive
-            dirExists = os.path.exists(self.delDirectory)
+            status = self.dirMonitor.getStatus()
+            dirExists = status.get("exists", False)
             active = enabled and dirExists
 
             self.l_delDirText.setEnabled(enabled)
             self.e_deleteDir.setEnabled(enabled)
             self.but_fileDialogue.setEnabled(enabled)
+            self.chb_useSqlite.setEnabled(active)
+            self.chb_dedup.setEnabled(active)
+            self.chb_volumeTrash.setEnabled(active)
             self.l_hours.setEnabled(active)
             self.spb_hours.setEnabled(active)
             self.l_tempDirSizeLabel.setEnabled(active)
+            self.l_quota.setEnabled(active)
+            self.spb_quota.setEnabled(active)
+            self.l_quotaPolicy.setEnabled(active)
+            self.cb_quotaPolicy.setEnabled(active)
+            self.l_archive.setEnabled(active)
+            self.spb_archive.setEnabled(active)
+            self.l_archiveFormat.setEnabled(active)
+            self.cb_archiveFormat.setEnabled(active)
             self.e_tempDirSize.setEnabled(active)
-            if enabled and not dirExists:
-                #   If Delete Dir is does not exist
-                self.table_delItems.setRowCount(10)
-                # Add message to Table
-                self.table_delItems.setItem(5, 1, QTableWidgetItem("DELETE DIRECTORY"))
-                self.table_delItems.setItem(5, 2, QTableWidgetItem("DOES NOT EXIST."))
-                self.table_delItems.setEnabled(False)
-            else:
-                self.table_delItems.setEnabled(active)
+            #   If Delete Dir is does not exist or cannot be written to
+            if not dirExists:
+                self.l_tableMessage.setText("DELETE DIRECTORY DOES NOT EXIST.")
+            elif not status.get("writable"):
+                self.l_tableMessage.setText("DELETE DIRECTORY IS NOT WRITABLE.")
+            self.l_tableMessage.setVisible(enabled and not (dirExists and status.get("writable")))
+            if dirExists:
+                self.e_deleteDir.setToolTip(f"Free space: {formatSize(status.get('freeSpace', 0))}")
+            self.table_delItems.setEnabled(active)
+            self.e_filterItems.setEnabled(active)
             self.but_openDir.setEnabled(active)
             self.but_refreshList.setEnabled(active)
             self.but_undoLast.setEnabled(active)
@@ -340,12 +772,23 @@ class Prism_DeleteFunctions_Functions(object):
     def connections(self):
 
         self.chb_usedelete.toggled.connect(lambda: self.configureUI())
+        self.chb_useSqlite.toggled.connect(lambda checked: self.switchLedgerBackend(checked))
+        self.chb_dedup.toggled.connect(lambda: self.saveSettings())
+        self.chb_volumeTrash.toggled.connect(lambda: self.saveSettings())
+        self.e_filterItems.textChanged.connect(lambda text: self.filterTable(text))
+        self.table_delItems.horizontalHeader().sortIndicatorChanged.connect(
+            lambda column, order: self.sortTable(column, order))
+        self.chb_currentProject.toggled.connect(lambda: self.populateTable())
         self.but_fileDialogue.clicked.connect(lambda: self.openExplorer(set=True))
         self.but_openDir.clicked.connect(lambda: self.openExplorer(set=False))
         self.spb_hours.editingFinished.connect(lambda: self.updateAutoPurger())
+        self.spb_quota.editingFinished.connect(lambda: self.updateQuota())
+        self.cb_quotaPolicy.activated.connect(lambda: self.updateQuota())
+        self.spb_archive.editingFinished.connect(lambda: self.updateArchive())
+        self.cb_archiveFormat.activated.connect(lambda: self.saveSettings())
         self.but_refreshList.clicked.connect(lambda: self.refreshList())
         self.but_undoLast.clicked.connect(lambda: self.restoreSelected())
-        self.but_purgeSelected.clicked.connect(lambda: self.purgeFiles(mode="single"))
+        self.but_purgeSelected.clicked.connect(lambda: self.purgeFiles(mode="selected"))
         self.but_purgeAll.clicked.connect(lambda: self.purgeFiles(mode="all"))
 
 
@@ -379,71 +822,185 @@ class Prism_DeleteFunctions_Functions(object):
 
     #   Load Settings from json
     @err_catcher(name=__name__)
-    def loadSettings(self):
+    def loadSettings(self, updateUI=True):
         logger.debug("Loading Settings.")
 
         try:
-            with open(self.settingsFile, "r") as json_file:
-                data = json.load(json_file)
-
-                self.deleteActive = data["Delete Active"]
-                self.updateInterval = data["UpdateInterval"]
-                self.delDirectory = data.get("Delete Directory")
-
+            #   Settings file is only re-parsed if it has changed on disk
+            snapshotChanged = self.settingsCache.isStale()
+            data = self.settingsCache.read()
+
+            self.deleteActive = data["Delete Active"]
+            self.updateInterval = data["UpdateInterval"]
+            self.delDirectory = data.get("Delete Directory")
+            self.dirMonitor.setPath(self.delDirectory)
+            self.deleteQuota = data.get("Delete Quota", 0)
+            self.quotaPolicy = data.get("Quota Policy", "Oldest")
+            self.dedupFiles = data.get("Dedup Files", False)
+            self.archiveAfter = data.get("Archive After", 0)
+            self.archiveFormat = data.get("Archive Format", "gzip")
+            self.volumeTrash = data.get("Volume Trash", False)
+            self.trashRoots = data.get("Trash Roots", [])
+
+            #   Rebuilds the Ledger from the "Items" snapshot and the journal if the snapshot changed,
+            #   otherwise only applies new journal entries
+            backend = data.get("Ledger Backend", "JSON")
+            if snapshotChanged or backend != self.ledgerBackend:
+                self.loadLedger(backend, data.get("Items", []))
+                self.updatePurgeSchedule()
+            elif self.ledger.sync():
+                self.updatePurgeSchedule()
+
+            if updateUI:
+                #   Checkboxes that save when toggled are filled without signals, so the
+                #   widgets that are not filled yet are not saved
+                blockedWidgets = []
                 try:
+                    blockedWidgets = [self.chb_dedup, self.chb_volumeTrash]
+                    for widget in blockedWidgets:
+                        widget.blockSignals(True)
+
                     self.chb_usedelete.setChecked(self.deleteActive)
+                    self.chb_useSqlite.setChecked(self.ledgerBackend == "SQLite")
+                    self.chb_dedup.setChecked(self.dedupFiles)
+                    self.chb_volumeTrash.setChecked(self.volumeTrash)
+                    self.spb_archive.setValue(self.archiveAfter)
+                    self.cb_archiveFormat.setCurrentText(self.archiveFormat)
                     self.e_deleteDir.setText(self.delDirectory)
                     self.spb_hours.setValue(self.updateInterval)
+                    self.spb_quota.setValue(self.deleteQuota)
+                    self.cb_quotaPolicy.setCurrentText(self.quotaPolicy)
                 except:
                     pass
+                finally:
+                    for widget in blockedWidgets:
+                        widget.blockSignals(False)
 
-                # Check if "Items" key exists in the loaded data
-                if "Items" in data:
-                    self.delFileInfoList = data["Items"]
-                    try:
-                        # Clear the existing rows in the table
-                        self.table_delItems.setRowCount(0)
-
-                        #   Temporalily disable sorting to load table correctly
-                        self.table_delItems.setSortingEnabled(False)
-
-                        # Populate the table with data from delFileInfoList
-                        for item in self.delFileInfoList:
-                            rowPosition = self.table_delItems.rowCount()
-                            self.table_delItems.insertRow(rowPosition)
-
-                            self.table_delItems.setItem(rowPosition, 0, QTableWidgetItem(item["Project"]))
-                            self.table_delItems.setItem(rowPosition, 1, QTableWidgetItem(item["Type"]))
-                            self.table_delItems.setItem(rowPosition, 2, QTableWidgetItem(item["Entity"]))
-                            self.table_delItems.setItem(rowPosition, 3, QTableWidgetItem(item["Deleted"]))
-                            #   Loads the data even though column is hidden from theUI
-                            self.table_delItems.setItem(rowPosition, 4, QTableWidgetItem(item["UID"]))
-
-                        # Reset Table Sorting Behavior
-                        self.table_delItems.setSortingEnabled(True)
-                        self.table_delItems.sortByColumn(3, Qt.DescendingOrder)  # Default sorting by "Deleted" column, descending order
-
-                    except:
-                        pass
-
-            self.configureUI()
+                self.populateTable()
+                self.calcDelDirSize()
+                self.configureUI()
 
         # Create the settings file if it doesn't exist
         except FileNotFoundError:
             logger.debug("Settings file does not exist. Creating New.")
             self.createSettings()
 
-        #   Delete and Create Corrupt Settings File
-        except:
-            logger.warning("ERROR: Settings file currupt.  Removing existing file.")
+        except Exception as e:
+            #   Error was not in the settings file, so it is left as is
+            if isValidSettingsFile(self.settingsFile):
+                logger.warning(f"ERROR: Unable to load Settings:  {e}")
+                return
+
+            #   Keeps the corrupt file, and restores the newest readable backup
+            logger.warning("ERROR: Settings file corrupt.  Restoring from backup.")
+            os.replace(self.settingsFile, f"{self.settingsFile}.corrupt")
+            self.settingsCache.clear()
+
+            for num in range(1, self.settingsBackups + 1):
+                backupFile = f"{self.settingsFile}.bak{num}"
+                if isValidSettingsFile(backupFile):
+                    shutil.copy2(backupFile, self.settingsFile)
+                    self.core.popup("Error Opening Config File.\n\n"
+                                    f"Restored the backup:\n{backupFile}"
+                                    )
+                    self.loadSettings(updateUI)
+                    return
+
             self.core.popup("Error Opening Config File.\n\n"
                             "Reverting to defaults"
                             )
-            os.remove(self.settingsFile)
-
             self.createSettings()
 
 
+    #   Lightweight settings check used by the right-click menus
+    @err_catcher(name=__name__)
+    def syncSettings(self):
+        #   Pending changes are written first, so they are not replaced by the file on disk
+        self.flushSettings()
+
+        #   Only reloads if the settings file was changed on disk, and does not touch the table
+        if self.settingsCache.isStale():
+            self.loadSettings(updateUI=False)
+        elif self.ledger.sync():
+            self.updatePurgeSchedule()
+
+
+    @err_catcher(name=__name__)
+    def populateTable(self):
+        #   Resets the model to the Ledger.  No rows are created until they are fetched
+        try:
+            projectName = self.getTableProject()
+            if projectName:
+                #   Uses the Project index of the Ledger
+                self.itemsModel.setItems(self.ledger.byProject(projectName))
+            else:
+                self.itemsModel.setItems(self.ledger.items())
+
+            #   Keeps a sort on another column complete after the reset
+            header = self.table_delItems.horizontalHeader()
+            self.sortTable(header.sortIndicatorSection(), header.sortIndicatorOrder())
+        except:
+            pass
+
+
+    #   Returns the Project the table is limited to, or None for all Projects
+    @err_catcher(name=__name__)
+    def getTableProject(self):
+        try:
+            if self.chb_currentProject.isChecked():
+                return self.core.projectName
+        except:
+            pass
+
+        return None
+
+
+    #   Updates only the changed rows after a delete, restore or purge
+    @err_catcher(name=__name__)
+    def updateTableRows(self, op, items=None, UIDs=None, allItems=False):
+        try:
+            if op == "delete":
+                projectName = self.getTableProject()
+                self.itemsModel.addItems([item for item in items or []
+                                          if not projectName or item.get("Project") == projectName])
+            elif op == "update":
+                self.itemsModel.updateItems(items or [])
+            elif allItems:
+                self.itemsModel.setItems([])
+            else:
+                self.itemsModel.removeUIDs(UIDs or [])
+        except:
+            pass
+
+
+    @err_catcher(name=__name__)
+    def filterTable(self, text):
+        #   Filtering needs all the rows, so the rest of the pages are fetched
+        if text:
+            self.itemsModel.fetchAll()
+
+        self.itemsProxy.setFilterFixedString(text)
+
+
+    @err_catcher(name=__name__)
+    def sortTable(self, column, order):
+        #   Model is already newest first, so later pages only append to that order.  Any
+        #   other sort needs all the rows, otherwise fetched rows land in the middle
+        if (column, order) != (3, Qt.DescendingOrder):
+            self.itemsModel.fetchAll()
+
+
+    #   Returns the UIDs of the selected table rows
+    @err_catcher(name=__name__)
+    def getSelectedUIDs(self):
+        UIDs = []
+        for proxyIndex in self.table_delItems.selectionModel().selectedRows():
+            sourceIndex = self.itemsProxy.mapToSource(proxyIndex)
+            UIDs.append(self.itemsModel.getUID(sourceIndex.row()))
+
+        return UIDs
+
+
     #   Save Settings to json
     @err_catcher(name=__name__)
     def createSettings(self):
@@ -451,41 +1008,349 @@ class Prism_DeleteFunctions_Functions(object):
         self.deleteActive = False
         self.updateInterval = 0
         self.delDirectory = ""
-        self.delFileInfoList = []
+        self.ledger.load([])
 
         logger.debug("Created settings file.")
-        self.saveSettings()
+        self.saveSettings(immediate=True)
 
 
-    #   Save Settings to json
+    #   Save Settings to json.  Saves are coalesced into one write after a short delay
     @err_catcher(name=__name__)
-    def saveSettings(self, origin=None):
+    def saveSettings(self, origin=None, immediate=False, updateUI=True):
         try:
             self.updateInterval = self.spb_hours.value()
+            self.deleteQuota = self.spb_quota.value()
+            self.quotaPolicy = self.cb_quotaPolicy.currentText()
+            self.dedupFiles = self.chb_dedup.isChecked()
+            self.archiveAfter = self.spb_archive.value()
+            self.archiveFormat = self.cb_archiveFormat.currentText()
+            self.volumeTrash = self.chb_volumeTrash.isChecked()
         except:
             pass
 
+        if immediate:
+            self.writeSettings(updateUI)
+        else:
+            self.saveUpdatesUI = self.saveUpdatesUI or updateUI
+            self.saveTimer.start()
+
+
+    #   Writes a pending save now.  The settings UI is only refreshed if the save came from it
+    @err_catcher(name=__name__)
+    def flushSettings(self):
+        if self.saveTimer.isActive():
+            self.writeSettings()
+
+
+    @err_catcher(name=__name__)
+    def writeSettings(self, updateUI=None):
+        self.saveTimer.stop()
+
+        #   Coalesced saves use what the pending saves asked for
+        if updateUI is None:
+            updateUI = self.saveUpdatesUI
+        self.saveUpdatesUI = False
+
         try:
+            #   Moves the journal aside and applies what is left in it, so entries appended by
+            #   other sessions while writing go to a new journal instead of being truncated
+            self.ledger.rotate()
+
+            #   Items are held in the database when using the SQLite index
+            if self.ledgerBackend == "SQLite":
+                items = []
+            else:
+                items = self.ledger.items()
+
+            data = {"Delete Active": self.deleteActive,
+                    "UpdateInterval": self.updateInterval,
+                    "Delete Directory": self.delDirectory,
+                    "Delete Quota": self.deleteQuota,
+                    "Quota Policy": self.quotaPolicy,
+                    "Dedup Files": self.dedupFiles,
+                    "Archive After": self.archiveAfter,
+                    "Archive Format": self.archiveFormat,
+                    "Volume Trash": self.volumeTrash,
+                    "Trash Roots": self.trashRoots,
+                    "Ledger Backend": self.ledgerBackend,
+                    "Items": items}
+
             # Save settings to Plugin Settings File
-            with open(self.settingsFile, "w") as json_file:
-                json.dump({"Delete Active": self.deleteActive,
-                        "UpdateInterval": self.updateInterval,
-                            "Delete Directory": self.delDirectory,
-                            "Items": self.delFileInfoList},
-                            json_file,
-                            indent=4
-                            )
-        
+            writeJsonAtomic(self.settingsFile, data, backups=self.settingsBackups)
+
+            #   Stores what was just written so the reload does not re-parse the file
+            self.settingsCache.update(data)
+            #   The snapshot now contains the rotated journal entries
+            self.ledger.compacted(self.settingsCache.signature)
+
             logger.debug("Saved settings file.")
-            self.loadSettings()
+            self.loadSettings(updateUI=updateUI)
 
         except Exception as e:
             logger.warning(f"ERROR: Unable to save Settings file:  {e}")
 
 
+    #   Creates the Ledger for the selected backend
+    @err_catcher(name=__name__)
+    def loadLedger(self, backend, snapshotItems):
+        if backend == "SQLite" and sqlite3 is None:
+            logger.warning("SQLite is not available.  Using the settings file for Deleted items.")
+            backend = "JSON"
+
+        if backend == "SQLite":
+            if not isinstance(self.ledger, SqliteLedger):
+                self.ledger = SqliteLedger(self.ledgerDbFile)
+
+            #   One-time migration of the "Items" array and journal into the database
+            if not self.ledger.isMigrated():
+                logger.debug("Migrating Deleted items to SQLite index.")
+                jsonLedger = DeleteLedger(self.journalFile)
+                jsonLedger.load(snapshotItems)
+                self.ledger.migrate(jsonLedger.items())
+                jsonLedger.truncate()
+
+        else:
+            if not isinstance(self.ledger, DeleteLedger):
+                self.ledger.close()
+                self.ledger = DeleteLedger(self.journalFile, settingsFile=self.settingsFile)
+
+            self.ledger.load(snapshotItems, self.settingsCache.signature)
+
+        self.ledgerBackend = backend
+        self.dirNameCounters = None
+        self.migrateDeletedTimes()
+
+
+    #   Converts "Deleted" strings from older versions to epoch seconds
+    @err_catcher(name=__name__)
+    def migrateDeletedTimes(self):
+        legacyItems = []
+        for item in self.ledger.items():
+            if "DeletedTime" not in item:
+                deletedTime = getDeletedTime(item)
+                legacyItems.append(dict(item, Deleted=formatDeletedTime(deletedTime), DeletedTime=deletedTime))
+
+        if legacyItems:
+            logger.debug(f"Migrating {len(legacyItems)} Deleted items to epoch timestamps.")
+            self.ledger.record("update", items=legacyItems)
+
+
+    #   Called from the settings checkbox
+    @err_catcher(name=__name__)
+    def switchLedgerBackend(self, useSqlite):
+        backend = "SQLite" if useSqlite else "JSON"
+        if backend == self.ledgerBackend:
+            return
+
+        if backend == "SQLite" and sqlite3 is None:
+            self.core.popup("SQLite is not available in this version of Python.")
+            self.chb_useSqlite.setChecked(False)
+            return
+
+        logger.debug(f"Switching Deleted items to {backend}")
+
+        self.ledger.sync()
+        currentItems = self.ledger.items()
+
+        if backend == "SQLite":
+            sqliteLedger = SqliteLedger(self.ledgerDbFile)
+            sqliteLedger.migrate(currentItems)
+            self.ledger.truncate()
+            self.ledger = sqliteLedger
+
+        else:
+            #   Clears the database so a later switch back migrates again
+            self.ledger.reset()
+            self.ledger.close()
+            self.ledger = DeleteLedger(self.journalFile, settingsFile=self.settingsFile)
+            self.ledger.truncate()
+            #   Settings file still has the SQLite snapshot until it is saved below
+            self.ledger.load(currentItems, self.settingsCache.getSignature())
+
+        self.ledgerBackend = backend
+        self.saveSettings(immediate=True)
+
+
+    #   Records a delete, restore or purge in the Ledger
+    @err_catcher(name=__name__)
+    def commitLedger(self, op, items=None, UIDs=None, allItems=False):
+        try:
+            #   Appends a single journal entry instead of rewriting the settings file
+            applied = self.ledger.record(op, items=items, UIDs=UIDs, allItems=allItems)
+        except Exception as e:
+            logger.warning(f"ERROR: Unable to write Delete Journal:  {e}")
+            return False
+
+        #   Entries from other sessions were also applied, so the whole table is reloaded
+        if applied > 1:
+            self.populateTable()
+            self.updatePurgeSchedule()
+        else:
+            self.updateTableRows(op, items=items, UIDs=UIDs, allItems=allItems)
+            if op == "delete":
+                self.updatePurgeSchedule(items)
+
+        self.calcDelDirSize()
+
+        #   Compacts the journal into the settings file snapshot periodically.  The reload after
+        #   the write does not see any changes, so the table and schedule are updated first
+        if self.ledger.needsCompaction():
+            logger.debug("Compacting Delete Journal.")
+            self.saveSettings(updateUI=False)
+
+        return True
+
+
+    #   UIDs of items that a running job is working on
+    @err_catcher(name=__name__)
+    def getBusyUIDs(self):
+        return self.purgingUIDs | self.restoringUIDs | self.archivingUIDs
+
+
+    #   Called when the archive age is changed
+    @err_catcher(name=__name__)
+    def updateArchive(self):
+        self.saveSettings()
+
+        if hasattr(self, "autoPurger"):
+            self.autoPurger.schedule()
+            self.archiveAged()
+
+
+    #   Packs items older than the archive age into compressed archives in the background
+    @err_catcher(name=__name__)
+    def archiveAged(self):
+        if self.archiveAfter <= 0:
+            return
+
+        #   Items would be purged before they are archived
+        if 0 < self.updateInterval <= self.archiveAfter:
+            return
+
+        busyUIDs = self.getBusyUIDs()
+        cutoff = time.time() - self.archiveAfter * 3600
+        items = [item for item in self.ledger.expired(cutoff)
+                 if not item.get("Archive") and not item.get("VolumeDirs") and item["UID"] not in busyUIDs]
+        if not items:
+            return
+
+        logger.debug(f"Archiving {len(items)} Deleted items")
+
+        UIDs = [item["UID"] for item in items]
+        self.archivingUIDs.update(UIDs)
+
+        job = {"items": items,
+               "UIDs": UIDs,
+               "format": self.archiveFormat
+               }
+
+        self.startJob(ArchiveWorker(job),
+                      "Archiving Deleted items..",
+                      len(items),
+                      self.onArchiveFinished,
+                      self.onArchiveFailed,
+                      showProgress=False
+                      )
+
+
+    @err_catcher(name=__name__)
+    def onArchiveFinished(self, worker, job):
+        self.endJob(worker, job)
+        self.archivingUIDs.difference_update(job["UIDs"])
+
+        #   Single Ledger write with the archive paths and manifests
+        if job["archivedItems"]:
+            logger.debug(f"SUCCESS:  Archived {len(job['archivedItems'])} items")
+            self.commitLedger("update", items=job["archivedItems"])
+
+        for entity, error in job["failures"]:
+            logger.warning(f"ERROR: Unable to Archive {entity}.  {error}")
+
+
+    @err_catcher(name=__name__)
+    def onArchiveFailed(self, worker, job):
+        self.endJob(worker, job)
+        self.archivingUIDs.difference_update(job["UIDs"])
+
+        logger.warning(f"ERROR: Unable to Archive Deleted items.  {job['error']}")
+
+
+    #   Called when the quota settings are changed
+    @err_catcher(name=__name__)
+    def updateQuota(self):
+        self.saveSettings()
+        self.enforceQuota()
+
+
+    #   Purges items until the Delete Dir is back under the quota
+    @err_catcher(name=__name__)
+    def enforceQuota(self, excludeUIDs=()):
+        if not self.deleteQuota:
+            return
+
+        totalSize, unmeasured = self.ledger.totalSize()
+        excess = totalSize - self.deleteQuota * 1024**3
+        if excess <= 0:
+            return
+
+        #   Gets candidates in eviction order from the Ledger, fetching more until enough is freed
+        evictItems = []
+        freedSize = 0
+        limit = 50
+        while True:
+            candidates = self.ledger.evictionCandidates(self.quotaPolicy, limit)
+
+            evictItems = []
+            freedSize = 0
+            for item in candidates:
+                if freedSize >= excess:
+                    break
+                #   The new item is not evicted by its own Delete
+                if item["UID"] in excludeUIDs:
+                    continue
+
+                #   Items already being purged count towards the freed size
+                freedSize += item.get("Size", 0)
+                if item["UID"] not in self.purgingUIDs:
+                    evictItems.append(item)
+
+            if freedSize >= excess or len(candidates) < limit:
+                break
+            limit *= 4
+
+        #   Purging everything else would still leave the Delete Dir over the quota, for
+        #   example when the new item alone is larger than it, so nothing is evicted
+        if freedSize < excess:
+            logger.warning(f"Delete Dir is over the quota by {formatSize(excess)}, and cannot be "
+                           f"brought under it by purging the other items.  Nothing was purged.")
+            return
+
+        if evictItems:
+            logger.info(f"Delete Dir is over the quota by {formatSize(excess)}.  "
+                        f"Purging {len(evictItems)} {self.quotaPolicy.lower()} items.")
+            self.startPurge(evictItems, showProgress=False)
+
+
+    #   Adds new items to the AutoPurger's expiry index, or rebuilds it if no items are passed
+    @err_catcher(name=__name__)
+    def updatePurgeSchedule(self, items=None):
+        #   AutoPurger is only created in Prism Standalone
+        if not hasattr(self, "autoPurger"):
+            return
+
+        if items is None:
+            self.autoPurger.rebuild()
+        else:
+            self.autoPurger.addItems(items)
+
+
     # Launches and updates AutoPurger
     @err_catcher(name=__name__)
     def updateAutoPurger(self, mode="refresh"):
+        #   AutoPurger is only created in Prism Standalone
+        if not hasattr(self, "autoPurger"):
+            self.saveSettings()
+            return
 
         if mode == "launch":
             if self.autoPurger.isRunning():
@@ -502,6 +1367,8 @@ class Prism_DeleteFunctions_Functions(object):
             self.autoPurger.run(self.updateInterval)
         else:
             logger.info("AutoPurger Disabled")
+            #   Timer is still used for archiving
+            self.autoPurger.schedule()
 
         self.saveSettings()
 
@@ -510,65 +1377,98 @@ class Prism_DeleteFunctions_Functions(object):
     @err_catcher(name=__name__)
     def deleteSceneFile(self, origin, rcmenu, filePath):
         self.menuContext = "Scene Files"
-        self.loadSettings()
+        self.syncSettings()
 
         if self.isDeleteActive() and os.path.isfile(filePath):
 
-            logger.debug("Loading Scene Data")
-
             try:
-                #   Retrieves File Info from Core
-                sceneData = self.core.getScenefileData(filePath)
-                sourceDir, sourceFilename = ntpath.split(sceneData["filename"])
-
-                projectName = self.core.projectName
+                #   The delete plan is only built when the action is triggered
+                deleteAct = QAction("Delete Version", rcmenu)
+                deleteAct.triggered.connect(lambda: self.deleteAction(self.getSceneFileDeleteData(filePath)))
+                rcmenu.addAction(deleteAct)
 
-                if sceneData["type"] == "shot":
-                    sequence = sceneData["sequence"]
-                    shot = sceneData["shot"]
-                    entity = f"{sequence}_{shot}"
-                else:
-                    entity = sceneData["asset"]
+                #   Adds a batch Delete if several Scene Files are selected
+                selectedFiles = self.getSelectedSceneFiles(origin)
+                if len(selectedFiles) > 1:
+                    batchAct = QAction(f"Delete {len(selectedFiles)} Selected Versions", rcmenu)
+                    batchAct.triggered.connect(lambda: self.batchDeleteAction(
+                        [self.getSceneFileDeleteData(path) for path in selectedFiles if os.path.isfile(path)]))
+                    rcmenu.addAction(batchAct)
+            
+            except Exception as e:
+                msg = f"Cannot delete {os.path.basename(filePath)}\n\n{str(e)}"
+                self.core.popup(msg)
+                logger.warning(f"ERROR:  Cannot delete {os.path.basename(filePath)}. {e}")
 
-                department = sceneData["department"]
-                task = sceneData["task"]
-                version = sceneData["version"]
 
-                #   Creates deleteList from items in Dir
-                deleteList = []
-                for file in os.listdir(sourceDir):
-                    if version in file:
-                        item = {"location": version, "path": os.path.normpath(os.path.join(sourceDir, file))}
-                        deleteList.append(item)
+    #   Builds delEntityData for a Scene File version
+    @err_catcher(name=__name__)
+    def getSceneFileDeleteData(self, filePath):
+        logger.debug("Loading Scene Data")
 
-                questionText = (f"Are you sure you want to Delete:\n\n"
-                                f"Version: {version}"
-                                )
-                windowTitle = f"Delete {version}"
+        #   Retrieves File Info from Core
+        sceneData = self.core.getScenefileData(filePath)
+        sourceDir, sourceFilename = ntpath.split(sceneData["filename"])
 
-                #   Builds delEntityData to be passed to deleteAction
-                delEntityData = {}
-                delEntityData["projectName"] = projectName
-                delEntityData["delItemName"] = f"{entity}_{department}_{task}_{version}"
-                delEntityData["deleteList"] = deleteList
-                delEntityData["questText"] = questionText
-                delEntityData["questTitle"] = windowTitle
+        projectName = self.core.projectName
 
-                #   Adds Right Click Item
-                deleteAct = QAction("Delete Version", rcmenu)
-                deleteAct.triggered.connect(lambda: self.deleteAction(delEntityData))
-                rcmenu.addAction(deleteAct)
-            
-            except Exception as e:
-                msg = f"Cannot delete {delEntityData['delItemName']}\n\n{str(e)}"
-                self.core.popup(msg)
-                logger.warning(f"ERROR:  Cannot delete {delEntityData['delItemName']}. {e}")
+        if sceneData["type"] == "shot":
+            sequence = sceneData["sequence"]
+            shot = sceneData["shot"]
+            entity = f"{sequence}_{shot}"
+        else:
+            entity = sceneData["asset"]
+
+        department = sceneData["department"]
+        task = sceneData["task"]
+        version = sceneData["version"]
+
+        #   Creates deleteList from the version's files in Dir
+        deleteList = []
+        for file in self.versionIndex.getFiles(sourceDir, version):
+            item = {"location": version, "path": os.path.normpath(os.path.join(sourceDir, file))}
+            deleteList.append(item)
+
+        questionText = (f"Are you sure you want to Delete:\n\n"
+                        f"Version: {version}"
+                        )
+        windowTitle = f"Delete {version}"
+
+        #   Builds delEntityData to be passed to deleteAction
+        delEntityData = {}
+        delEntityData["projectName"] = projectName
+        delEntityData["delItemName"] = f"{entity}_{department}_{task}_{version}"
+        delEntityData["deleteList"] = deleteList
+        delEntityData["questText"] = questionText
+        delEntityData["questTitle"] = windowTitle
+
+        return delEntityData
+
+
+    #   Returns the Scene File paths of the selected rows in the Scene Browser
+    @err_catcher(name=__name__)
+    def getSelectedSceneFiles(self, origin):
+        filePaths = []
+        try:
+            selectedRows = origin.tw_scenefiles.selectionModel().selectedRows()
+        except:
+            return filePaths
+
+        for index in selectedRows:
+            fileData = index.data(Qt.UserRole)
+            if isinstance(fileData, dict):
+                fileData = fileData.get("filename")
+
+            if isinstance(fileData, str):
+                filePaths.append(fileData)
+
+        return filePaths
 
 
     @err_catcher(name=__name__)
     def deleteShotDepartment(self, origin, rcmenu, pos):
         self.menuContext = "Shot Dept"
-        self.loadSettings()
+        self.syncSettings()
 
         if self.isDeleteActive():
             try:
@@ -625,7 +1525,7 @@ class Prism_DeleteFunctions_Functions(object):
     def deleteShotTask(self, origin, rcmenu, pos):
 
         self.menuContext = "Shot Task"
-        self.loadSettings()
+        self.syncSettings()
 
         if self.isDeleteActive():
             try:
@@ -683,7 +1583,7 @@ class Prism_DeleteFunctions_Functions(object):
     def deleteAssetDepartment(self, origin, rcmenu, pos):
 
         self.menuContext = "Asset Dept"
-        self.loadSettings()
+        self.syncSettings()
 
         if self.isDeleteActive():
             try:
@@ -738,7 +1638,7 @@ class Prism_DeleteFunctions_Functions(object):
     def deleteAssetTask(self, origin, rcmenu, pos):
 
         self.menuContext = "Asset Task"
-        self.loadSettings()
+        self.syncSettings()
 
         if self.isDeleteActive():
             try:
@@ -796,119 +1696,198 @@ class Prism_DeleteFunctions_Functions(object):
     def deleteProduct(self, origin, viewUi, pos, rcmenu):
 
         self.menuContext = "Product"
-        self.loadSettings()
+        self.syncSettings()
 
         if self.isDeleteActive():
             try:
-                version = origin.getCurrentVersion()
-                if not version:
-                    return
-
                 #   Checks which Table was called
                 if viewUi == origin.tw_identifier:
                     listType = "identifier"
                 elif viewUi == origin.tw_versions:
                     listType = "version"
 
+                #   Only data already held by the tables is read here, the delete plan
+                #   is built when an action is triggered
                 if listType == "identifier":
                     #   Retrieves Product Data
                     item = origin.tw_identifier.itemAt(pos)
                     prodData = item.data(0, Qt.UserRole)
+                    product = prodData["product"]
+
+                    #   Add Command to Right-click Menu
+                    deleteAct = QAction(f"Delete {product}", viewUi)
+                    deleteAct.triggered.connect(lambda: self.deleteAction(
+                        self.getProductDeleteData(origin, prodData, "identifier")))
+                    rcmenu.addAction(deleteAct)
 
                 elif listType == "version":
                     #   Gets Source Path from Last Column - Assuming path is always last Column
                     row = viewUi.rowAt(pos.y())
                     numCols = viewUi.columnCount()
-                    if row >= 0:
-                        sourcePath = viewUi.item(row, numCols - 1).text()
-                    #   Retrieves File Info        
-                    infoFolder = self.core.products.getVersionInfoPathFromProductFilepath(sourcePath)
-                    infoPath = self.core.getVersioninfoPath(infoFolder)
-                    prodData = self.core.getConfig(configPath=infoPath)
+                    if row < 0:
+                        return
+                    sourcePath = viewUi.item(row, numCols - 1).text()
+                    version = self.getProductRowVersion(viewUi, row)
 
-                    #   Retrieves Product Data
-                    data = origin.getCurrentProduct()
+                    #   Retrieves File Info on trigger
+                    getDeleteData = lambda: self.getProductDeleteData(origin,
+                                                                     self.getProductVersionData(origin, sourcePath),
+                                                                     "version"
+                                                                     )
 
-                    version = prodData["version"]
-                    prodData["path"] = os.path.join(data["path"], version)
+                    #   Adds right-click Item
+                    deleteAct = QAction(f"Delete Version {version}", viewUi)
+                    deleteAct.triggered.connect(lambda: self.deleteAction(getDeleteData()))
+                    rcmenu.addAction(deleteAct)
 
-                prodData["project_name"] = self.core.projectName
+                    #   Adds a batch Delete if several Versions are selected
+                    selectedPaths = []
+                    for index in viewUi.selectionModel().selectedRows():
+                        selectedPaths.append(viewUi.item(index.row(), numCols - 1).text())
 
-                product = prodData["product"]
-                path = prodData["path"]
+                    if len(selectedPaths) > 1:
+                        batchAct = QAction(f"Delete {len(selectedPaths)} Selected Versions", viewUi)
+                        batchAct.triggered.connect(lambda: self.batchDeleteAction(
+                            [self.getProductDeleteData(origin, self.getProductVersionData(origin, path), "version")
+                             for path in selectedPaths]))
+                        rcmenu.addAction(batchAct)
 
-                if prodData["type"] == "asset":
-                    asset = prodData["asset"]
-                    entity = f"{asset}_{product}"
-                else:
-                    sequence = prodData["sequence"]
-                    shot = prodData["shot"]
-                    entity = f"{sequence}_{shot}_{product}"
+                    #   If there are multiple locations, will add Remove Menu
+                    if len(self.core.paths.getExportProductBasePaths()) > 1:
+                        removeMenu = QMenu(f"Remove Verion {version} from", viewUi)
+                        removeMenu.aboutToShow.connect(partial(self.populateRemoveMenu, removeMenu, getDeleteData))
+                        rcmenu.addMenu(removeMenu)
 
-                deleteList = []
+            except Exception as e:
+                prodErrName = "Product"
 
-            #   Retrieves Locations Data
-                saveLocs = origin.core.paths.getExportProductBasePaths()
+                msg = f"Cannot delete {prodErrName}\n\n{str(e)}"
+                self.core.popup(msg)
+                logger.warning(f"ERROR:  Cannot delete {prodErrName}. {e}")
 
-            #   Constructs deleteList with Location Names and Paths
-                for loc in saveLocs:
-                    newPath = self.core.convertPath(path, target=loc)
-                    if os.path.exists(newPath):
-                        locItem = {"location": loc, "path": newPath}
-                        deleteList.append(locItem)
 
-                #   Builds delEntityData to be passed to deleteAction
-                delEntityData = {}
-                delEntityData["projectName"] = prodData["project_name"]
-                delEntityData["deleteList"] = deleteList
+    #   Returns the Version name of a row in the Versions table, not the current Version
+    @err_catcher(name=__name__)
+    def getProductRowVersion(self, viewUi, row):
+        versionItem = viewUi.item(row, 0)
+        if not versionItem:
+            return ""
 
-                if listType == "identifier":
-                    questionText = f"Are you sure you want to Delete:\n\nProduct: {product}"
-                    windowTitle = f"Delete Product {product}"
+        versionData = versionItem.data(Qt.UserRole)
+        if isinstance(versionData, dict) and versionData.get("version"):
+            return versionData["version"]
 
-                    delEntityData["delItemName"] = entity
-                    delEntityData["questText"] = questionText
-                    delEntityData["questTitle"] = windowTitle
+        return versionItem.text()
 
-                    #   Add Command to Right-click Menu
-                    deleteAct = QAction(f"Delete {product}", viewUi)
-                    deleteAct.triggered.connect(lambda: self.deleteAction(delEntityData))
-                    rcmenu.addAction(deleteAct)
 
-                elif listType == "version":
-                    questionText = f"Are you sure you want to Delete:\n\nProduct Version: {version}"
-                    windowTitle = f"Delete Product Version {version}"
+    #   Adds Remove Menu items for each location the first time the menu is opened
+    @err_catcher(name=__name__)
+    def populateRemoveMenu(self, removeMenu, getDeleteData):
+        if removeMenu.actions():
+            return
 
-                    delEntityData["delItemName"] = f"{entity}_{version}"
-                    delEntityData["questText"] = questionText
-                    delEntityData["questTitle"] = windowTitle
+        delEntityData = getDeleteData()
+        if not delEntityData:
+            return
 
-                    #   Adds right-click Item
-                    deleteAct = QAction(f"Delete Version {version}", viewUi)
-                    deleteAct.triggered.connect(lambda: self.deleteAction(delEntityData))
-                    rcmenu.addAction(deleteAct)
+        for loc in delEntityData["deleteList"]:
+            removeFromAct = QAction(loc["location"], removeMenu)
+            removeFromAct.triggered.connect(partial(self.removeAction, delEntityData, loc))
+            removeMenu.addAction(removeFromAct)
 
-                    #   If there are multiple locations, will add Remove Menu
-                    if len(deleteList) > 1:
-                        removeMenu = QMenu(f"Remove Verion {version} from", viewUi)
+        #   Unreachable locations are listed but cannot be selected
+        for locName in delEntityData.get("unavailable", []):
+            unavailableAct = QAction(f"{locName} (unavailable)", removeMenu)
+            unavailableAct.setEnabled(False)
+            removeMenu.addAction(unavailableAct)
 
-                        #   Adds Remove Menu items for each location
-                        for loc in deleteList:
-                            removeFromAct = QAction(loc["location"], viewUi)
-                            removeFromAct.triggered.connect(partial(self.removeAction, delEntityData, loc))
-                            removeMenu.addAction(removeFromAct)
 
-                        rcmenu.addMenu(removeMenu)
+    #   Returns the deleteList of the locations where the path exists, and the
+    #   names of locations that could not be reached
+    @err_catcher(name=__name__)
+    def getLocationList(self, path, saveLocs):
+        locPaths = {loc: self.core.convertPath(path, target=loc) for loc in saveLocs}
+
+        #   Location roots are cached, so only the paths on reachable roots are checked
+        rootStatus = self.locationProber.probeRoots([saveLocs[loc] for loc in saveLocs])
+        unavailable = [loc for loc in saveLocs if not rootStatus.get(saveLocs[loc])]
+
+        checkPaths = [locPaths[loc] for loc in saveLocs if loc not in unavailable]
+        pathStatus = self.locationProber.probe(os.path.exists, checkPaths)
+
+        deleteList = []
+        for loc in saveLocs:
+            if loc in unavailable:
+                continue
+
+            exists = pathStatus.get(locPaths[loc])
+            if exists is None:
+                unavailable.append(loc)
+            elif exists:
+                locItem = {"location": loc, "path": locPaths[loc]}
+                deleteList.append(locItem)
 
-            except Exception as e:
-                try:
-                    prodErrName = delEntityData["delItemName"]
-                except:
-                    prodErrName = "Product"
+        if unavailable:
+            logger.warning(f"Locations unavailable: {', '.join(unavailable)}")
 
-                msg = f"Cannot delete {prodErrName}\n\n{str(e)}"
-                self.core.popup(msg)
-                logger.warning(f"ERROR:  Cannot delete {prodErrName}. {e}")
+        return deleteList, unavailable
+
+
+    #   Retrieves the Product Data of a Product Version from its versioninfo
+    @err_catcher(name=__name__)
+    def getProductVersionData(self, origin, sourcePath):
+        infoFolder = self.core.products.getVersionInfoPathFromProductFilepath(sourcePath)
+        infoPath = self.core.getVersioninfoPath(infoFolder)
+        prodData = self.core.getConfig(configPath=infoPath)
+
+        #   Retrieves Product Data
+        data = origin.getCurrentProduct()
+
+        prodData["path"] = os.path.join(data["path"], prodData["version"])
+
+        return prodData
+
+
+    #   Builds delEntityData for a Product or Product Version
+    @err_catcher(name=__name__)
+    def getProductDeleteData(self, origin, prodData, listType):
+        prodData["project_name"] = self.core.projectName
+
+        product = prodData["product"]
+        path = prodData["path"]
+
+        if prodData["type"] == "asset":
+            asset = prodData["asset"]
+            entity = f"{asset}_{product}"
+        else:
+            sequence = prodData["sequence"]
+            shot = prodData["shot"]
+            entity = f"{sequence}_{shot}_{product}"
+
+        #   Retrieves Locations Data
+        saveLocs = origin.core.paths.getExportProductBasePaths()
+
+        #   Constructs deleteList with Location Names and Paths
+        deleteList, unavailable = self.getLocationList(path, saveLocs)
+
+        #   Builds delEntityData to be passed to deleteAction
+        delEntityData = {}
+        delEntityData["projectName"] = prodData["project_name"]
+        delEntityData["deleteList"] = deleteList
+        delEntityData["unavailable"] = unavailable
+
+        if listType == "identifier":
+            delEntityData["delItemName"] = entity
+            delEntityData["questText"] = f"Are you sure you want to Delete:\n\nProduct: {product}"
+            delEntityData["questTitle"] = f"Delete Product {product}"
+
+        elif listType == "version":
+            version = prodData["version"]
+            delEntityData["delItemName"] = f"{entity}_{version}"
+            delEntityData["questText"] = f"Are you sure you want to Delete:\n\nProduct Version: {version}"
+            delEntityData["questTitle"] = f"Delete Product Version {version}"
+
+        return delEntityData
 
 
     @err_catcher(name=__name__)
@@ -916,7 +1895,7 @@ class Prism_DeleteFunctions_Functions(object):
         if not item:
             return
         
-        self.loadSettings()
+        self.syncSettings()
         self.menuContext = "Media"
 
         #   Gets Media Viewer Object
@@ -946,88 +1925,98 @@ class Prism_DeleteFunctions_Functions(object):
                     return
 
                 #   Get the Identifier name
-                identifier = data.get("identifier")
-                if not identifier:
+                if not data.get("identifier"):
                     return
 
-                if data["type"] == "asset":
-                    asset = data["asset"]
-                    entity = f"{asset}_{identifier}"
-                else:
-                    sequence = data["sequence"]
-                    shot = data["shot"]
-                    entity = f"{sequence}_{shot}_{identifier}"
-
-                deleteList = []
-                path = data["path"]
-
-                #   Retrieves Locations Data
-                saveLocs = origin.core.paths.getExportProductBasePaths()
-            
-                #   Constructs deleteList with Location Names and Paths
-                for loc in saveLocs:
-                    newPath = self.core.convertPath(path, target=loc)
-                    if os.path.exists(newPath):
-                        locItem = {"location": loc, "path": newPath}
-                        deleteList.append(locItem)
-
-                delEntityData = {}
-                delEntityData["projectName"] = data["project_name"]
-                delEntityData["deleteList"] = deleteList
+                #   The delete plan is only built when an action is triggered
+                getDeleteData = lambda: self.getMediaDeleteData(origin, data, listType)
 
                 #   Case 1 - Media Indentifier
                 if listType == "identifier":
-                    questionText = f"Are you sure you want to Delete:\n\nMedia Identifier: {identifier}\n\n"
-                    windowTitle = f"Delete Media: {identifier}"
-
-                    #   Populate Data to be Passed to deleteAction()
-                    delEntityData["delItemName"] = entity
-                    delEntityData["questText"] = questionText
-                    delEntityData["questTitle"] = windowTitle
-
                     #   Add Command to Right-click Menu
-                    deleteAct = QAction(f"Delete {identifier}", rcmenu)
-                    deleteAct.triggered.connect(lambda: self.deleteAction(delEntityData))
+                    deleteAct = QAction(f"Delete {data['identifier']}", rcmenu)
+                    deleteAct.triggered.connect(lambda: self.deleteAction(getDeleteData()))
                     rcmenu.addAction(deleteAct)
 
                 #   Case 2 - Media Version
                 elif listType == "version":
                     version = data["version"]
 
-                    questionText = f"Are you sure you want to Delete:\n\nMedia Version: {version}"
-                    windowTitle = f"Delete Media Version: {version}"
-
-                    delEntityData["delItemName"] = f"{entity}_{version}"
-                    delEntityData["questText"] = questionText
-                    delEntityData["questTitle"] = windowTitle
-
                     #   Adds right-click Item
                     deleteAct = QAction(f"Delete Version {version}", rcmenu)
-                    deleteAct.triggered.connect(lambda: self.deleteAction(delEntityData))
+                    deleteAct.triggered.connect(lambda: self.deleteAction(getDeleteData()))
                     rcmenu.addAction(deleteAct)
 
+                    #   Adds a batch Delete if several Versions are selected
+                    selectedData = [selItem.data(Qt.UserRole) for selItem in lw.selectedItems()]
+                    if len(selectedData) > 1:
+                        batchAct = QAction(f"Delete {len(selectedData)} Selected Versions", rcmenu)
+                        batchAct.triggered.connect(lambda: self.batchDeleteAction(
+                            [self.getMediaDeleteData(origin, selData, "version") for selData in selectedData]))
+                        rcmenu.addAction(batchAct)
+
                     #   If there are multiple locations, will add Remove Menu
-                    if len(deleteList) > 1:
+                    if len(self.core.paths.getExportProductBasePaths()) > 1:
                         removeMenu = QMenu(f"Remove Verion {version} from", rcmenu)
-
-                        #   Adds Remove Menu items for each location
-                        for loc in deleteList:
-                            removeFromAct = QAction(loc["location"], rcmenu)
-                            removeFromAct.triggered.connect(partial(self.removeAction, delEntityData, loc))
-                            removeMenu.addAction(removeFromAct)
-
+                        removeMenu.aboutToShow.connect(partial(self.populateRemoveMenu, removeMenu, getDeleteData))
                         rcmenu.addMenu(removeMenu)
 
             except Exception as e:
-                if hasattr(self, "delEntityData"):
-                    msg = f"Cannot delete {delEntityData['delItemName']}\n\n{str(e)}"
-                else:
-                    msg = f"Cannot delete Entity\n\n{str(e)}"
+                msg = f"Cannot delete Entity\n\n{str(e)}"
                     
                 self.core.popup(msg)
                 logger.warning(f"ERROR:  {msg}. {e}")
 
 
+    #   Builds delEntityData for a Media Identifier or Media Version
+    @err_catcher(name=__name__)
+    def getMediaDeleteData(self, origin, data, listType):
+        # Check if data is valid and if "isGroup" exists and is True
+        if not data or (hasattr(data, "isGroup") and data.get("isGroup", False)):
+            return None
+
+        #   Get the Identifier name
+        identifier = data.get("identifier")
+        if not identifier:
+            return None
+
+        if data["type"] == "asset":
+            asset = data["asset"]
+            entity = f"{asset}_{identifier}"
+        else:
+            sequence = data["sequence"]
+            shot = data["shot"]
+            entity = f"{sequence}_{shot}_{identifier}"
+
+        path = data["path"]
+
+        #   Retrieves Locations Data
+        saveLocs = origin.core.paths.getExportProductBasePaths()
+    
+        #   Constructs deleteList with Location Names and Paths
+        deleteList, unavailable = self.getLocationList(path, saveLocs)
+
+        delEntityData = {}
+        delEntityData["projectName"] = data["project_name"]
+        delEntityData["deleteList"] = deleteList
+        delEntityData["unavailable"] = unavailable
+
+        #   Case 1 - Media Indentifier
+        if listType == "identifier":
+            delEntityData["delItemName"] = entity
+            delEntityData["questText"] = f"Are you sure you want to Delete:\n\nMedia Identifier: {identifier}\n\n"
+            delEntityData["questTitle"] = f"Delete Media: {identifier}"
+
+        #   Case 2 - Media Version
+        elif listType == "version":
+            version = data["version"]
+            delEntityData["delItemName"] = f"{entity}_{version}"
+            delEntityData["questText"] = f"Are you sure you want to Delete:\n\nMedia Version: {version}"
+            delEntityData["questTitle"] = f"Delete Media Version: {version}"
+
+        return delEntityData
+
+
     @err_catcher(name=__name__)                                             #   TODO MORE INFO FOR LIBRARY ITEMS
     def deleteLibraryItem(self, origin, menu):
 
@@ -1035,7 +2024,7 @@ class Prism_DeleteFunctions_Functions(object):
             return
         
         self.menuContext = "Library Item"
-        self.loadSettings()
+        self.syncSettings()
 
         if self.deleteActive:
             try:
@@ -1080,7 +2069,9 @@ class Prism_DeleteFunctions_Functions(object):
     def removeAction(self, delEntityData, loc):
         logger.debug("Reformatting Delete Data for Remove Action")
 
-        #   Alters Data to reflect location
+        #   Alters a copy of the Data to reflect location
+        delEntityData = dict(delEntityData)
+        delEntityData["unavailable"] = []
         delEntityData["deleteList"] = [item for item in delEntityData["deleteList"] if item["location"] == loc["location"]]
         delEntityData["delItemName"] = f"{delEntityData['delItemName']} ({loc['location']})"
         delEntityData["questText"] = delEntityData["questText"].replace("Delete", "Remove")
@@ -1091,16 +2082,21 @@ class Prism_DeleteFunctions_Functions(object):
 
     @err_catcher(name=__name__)
     def deleteAction(self, delEntityData):
+        if not delEntityData:
+            return
 
-        projectName = delEntityData["projectName"]      #   PROJECT NAME
         delItemName = delEntityData["delItemName"]      #   ENTITY NAME
         deleteList = delEntityData["deleteList"]        #   ITEMS IN DIR TO MOVE
         questTitle = delEntityData["questTitle"]        #   FOR QUESTION POPUP
         questText = delEntityData["questText"]          #   FOR QUESTION POPUP
 
+        #   Files on unreachable locations are not moved
+        if delEntityData.get("unavailable"):
+            questText += ("\n\nThese locations are unavailable and will not be deleted:\n\n"
+                          + "\n".join(delEntityData["unavailable"]))
+
         #   Make timestamp
-        currentTime = datetime.now()
-        timestamp = currentTime.strftime("%m/%d/%y %H:%M")
+        deletedTime = time.time()
 
         #   Asks Popup Question
         result = self.core.popupQuestion(questText, title=questTitle)
@@ -1108,82 +2104,341 @@ class Prism_DeleteFunctions_Functions(object):
         if result == "Yes":
             logger.debug(f"Deleting: {delItemName}")
 
-            deletePopup = self.core.waitPopup(
-                self.core, "Deleting file(s) - please wait..\n\n\n"
-                )
-            deletePopup.show()
+            #   Captured here as the right-click menus change menuContext while the delete is running
+            deleteType = self.menuContext
+
+            job = self.makeDeleteJob(delEntityData, deleteType, deletedTime)
 
             try:
                 #   Temp disable Media Player to allow for deletion
-                if self.menuContext == "Media":
-                    viewOrigState = self.mediaViewer.state
+                if deleteType == "Media":
+                    job["mediaViewer"] = self.mediaViewer
+                    job["viewOrigState"] = self.mediaViewer.state
                     self.mediaViewer.state = "disabled"
                     self.mediaViewer.updatePreview()
 
-                origLocList = []
-                destDir, delItemName = self.ensureDirName(delItemName)
+                job["destDir"], job["delItemName"] = self.ensureDirName(delItemName)
+
+            except Exception as e:
+                job["error"] = e
+                self.onDeleteFailed(None, job)
+                return
 
-                #   For cases that just delete files in a Dir
-                if self.menuContext in ["Scene Files", "Library Item"]:
-                    for item in deleteList:
-                        #   Make dict with location details
-                        sourceItem = item["path"]
-                        destItem = os.path.join(destDir, item["location"])
-                        subDir = os.path.join(destDir, item["location"])
+            #   Hashes of the files already in the Delete Dir
+            if self.dedupFiles:
+                job["blobIndex"] = self.ledger.blobIndex()
 
-                        if not os.path.exists(subDir):
-                            os.mkdir(subDir)
-                        shutil.move(sourceItem, destItem)
-                        origLocList.append(item)
+            #   Moves the files on a worker thread and reports back with signals
+            self.startJob(DeleteWorker(job, self.moveEngine),
+                          f"Deleting {delItemName} - please wait..",
+                          len(deleteList),
+                          self.onDeleteFinished,
+                          self.onDeleteFailed
+                          )
 
-                else:
-                    #   For cases that delete an entire Dir
-                    for item in deleteList:
-                        sourceItem = item["path"]
-                        destItem = os.path.join(destDir, item["location"])
-
-                        shutil.move(sourceItem, destItem)
-                        origLocList.append(item)
-
-                #   Makes item dict to be saved in "Items" in settingsFile
-                fileInfo = {
-                    "Project": projectName,
-                    "Type": self.menuContext,
-                    "Entity": delItemName,
-                    "Deleted": timestamp,
-                    "UID": self.generateUID(),
-                    "OriginalLocation": origLocList,
-                    "DeletedLocation": destDir,
-                    }
-                
-                self.delFileInfoList.append(fileInfo)
 
-                #   Restore Media Player to orignal state
-                if self.menuContext == "Media":
-                    self.mediaViewer.state = viewOrigState
-                    self.mediaViewer.updatePreview()
+    #   Deletes several items with one confirmation, one Ledger write and one UI refresh
+    @err_catcher(name=__name__)
+    def batchDeleteAction(self, delEntityDataList):
+        delEntityDataList = [data for data in delEntityDataList if data and data["deleteList"]]
+        if not delEntityDataList:
+            return
+
+        names = "\n".join(data["delItemName"] for data in delEntityDataList[:20])
+        if len(delEntityDataList) > 20:
+            names += f"\n.. and {len(delEntityDataList) - 20} more"
 
-                logger.debug(f"SUCCESS: {delItemName} deleted")
+        questionText = f"Are you sure you want to Delete {len(delEntityDataList)} items:\n\n{names}"
+        result = self.core.popupQuestion(questionText, title=f"Delete {len(delEntityDataList)} items")
 
-                deletePopup.close()
+        if result != "Yes":
+            return
+
+        deleteType = self.menuContext
+        deletedTime = time.time()
+
+        logger.debug(f"Deleting {len(delEntityDataList)} items")
+
+        batch = {"delItemName": f"{len(delEntityDataList)} items",
+                 "type": deleteType,
+                 "jobs": [],
+                 "failures": []
+                 }
 
-                self.saveSettings()
-                #   Refresh ProjectBrowser
-                self.core.pb.refreshUI()
+        #   Temp disable Media Player to allow for deletion
+        if deleteType == "Media":
+            batch["mediaViewer"] = self.mediaViewer
+            batch["viewOrigState"] = self.mediaViewer.state
+            self.mediaViewer.state = "disabled"
+            self.mediaViewer.updatePreview()
 
+        #   Shared by the batch, so identical files in different items are linked as well
+        blobIndex = self.ledger.blobIndex() if self.dedupFiles else None
+
+        #   Delete Dir names are reserved up front so the moves can run concurrently
+        for delEntityData in delEntityDataList:
+            job = self.makeDeleteJob(delEntityData, deleteType, deletedTime)
+            if blobIndex is not None:
+                job["blobIndex"] = blobIndex
+            try:
+                job["destDir"], job["delItemName"] = self.ensureDirName(job["delItemName"])
+                batch["jobs"].append(job)
             except Exception as e:
-                if self.menuContext == "Product":
-                    self.core.popup(f"Unable to Delete: {delItemName}\n\nTry closing the Viewer Window\n\nError:\n\n{e}")
-                    logger.warning(f"ERROR: Unable to Delete: {delItemName}\n\nTry closing the Viewer Window\n\nError:\n\n{e}")
+                job["error"] = e
+                batch["failures"].append(job)
 
+        self.startJob(BatchDeleteWorker(batch, self.moveEngine),
+                      f"Deleting {len(delEntityDataList)} items - please wait..",
+                      len(batch["jobs"]),
+                      self.onBatchDeleteFinished,
+                      self.onDeleteFailed
+                      )
 
-                elif self.menuContext == "Media":
-                    self.core.popup(f"Unable to Delete: {delItemName}\n\nTry disabling the Media Viewer\n\nError:\n\n{e}")
-                    logger.warning(f"ERROR: Unable to Delete: {delItemName}\n\nTry disabling the Media Viewer\n\nError:\n\n{e}")
 
-                else:
-                    self.core.popup(f"Unable to Delete: {delItemName}\n\n{e}")
-                    logger.warning(f"ERROR: Unable to Delete: {delItemName}\n\n{e}")
+    @err_catcher(name=__name__)
+    def makeDeleteJob(self, delEntityData, deleteType, deletedTime):
+        UID = generateUID(deletedTime)
+
+        job = {"projectName": delEntityData["projectName"],
+               "delItemName": delEntityData["delItemName"],
+               "type": deleteType,
+               "deleteList": delEntityData["deleteList"],
+               "deletedTime": deletedTime,
+               "UID": UID,
+               "txnFile": os.path.join(self.transactionDir, f"{UID}.jsonl"),
+               "origLocList": [],
+               "size": 0,
+               "fileCount": 0,
+               "trashRoots": self.getTrashRoots(),
+               "volumeDirs": []
+               }
+
+        return job
+
+
+    #   Returns the trash roots that files on other volumes can be moved to
+    @err_catcher(name=__name__)
+    def getTrashRoots(self):
+        trashRoots = list(self.trashRoots)
+
+        if self.volumeTrash:
+            try:
+                basePaths = list(self.core.paths.getExportProductBasePaths().values())
+            except Exception:
+                basePaths = []
+            if getattr(self.core, "projectPath", None):
+                basePaths.append(self.core.projectPath)
+
+            trashRoots += [os.path.join(basePath, VOLUME_TRASH_NAME) for basePath in basePaths]
+
+        #   Removes duplicates, keeping the order
+        roots = {}
+        for root in trashRoots:
+            roots.setdefault(TrashScanner.getKey(root), root)
+
+        return list(roots.values())
+
+
+    #   Returns the trash roots that hold Deleted items, for scanning and purging
+    @err_catcher(name=__name__)
+    def getUsedTrashRoots(self):
+        roots = {}
+        for item in self.ledger.items():
+            for volumeDir in item.get("VolumeDirs", []):
+                root = os.path.dirname(os.path.normpath(volumeDir))
+                roots[TrashScanner.getKey(root)] = root
+
+        for root in self.getTrashRoots():
+            roots.setdefault(TrashScanner.getKey(root), root)
+
+        return list(roots.values())
+
+
+    #   Makes item dict to be saved in the Ledger
+    @err_catcher(name=__name__)
+    def makeFileInfo(self, job):
+        fileInfo = {
+            "Project": job["projectName"],
+            "Type": job["type"],
+            "Entity": job["delItemName"],
+            "Deleted": formatDeletedTime(job["deletedTime"]),
+            "DeletedTime": job["deletedTime"],
+            "UID": job["UID"],
+            "OriginalLocation": job["origLocList"],
+            "DeletedLocation": job["destDir"],
+            "Size": job["size"],
+            "FileCount": job["fileCount"],
+            }
+
+        #   Item Dirs in the trash roots of other volumes
+        if job.get("volumeDirs"):
+            fileInfo["VolumeDirs"] = job["volumeDirs"]
+
+        #   Hashes of the deduplicated files, by path relative to the DeletedLocation
+        if job.get("blobs"):
+            fileInfo["Blobs"] = job["blobs"]
+
+        return fileInfo
+
+
+    #   Runs a worker on the thread pool with a non-blocking progress popup
+    @err_catcher(name=__name__)
+    def startJob(self, worker, labelText, total, onFinished, onFailed, showProgress=True):
+        if showProgress:
+            progressPopup = QProgressDialog(labelText, "Cancel", 0, total)
+            progressPopup.setWindowTitle("Delete Functions")
+            progressPopup.setWindowModality(Qt.NonModal)
+            #   Deletes can be cancelled, and are rolled back by the worker
+            if hasattr(worker, "cancel"):
+                progressPopup.canceled.connect(worker.cancel)
+            else:
+                progressPopup.setCancelButton(None)
+            progressPopup.setMinimumDuration(0)
+            progressPopup.show()
+
+            worker.job["progressPopup"] = progressPopup
+
+            worker.signals.progress.connect(lambda num, total, text: self.updateJobProgress(progressPopup, num, total, text))
+
+        worker.signals.finished.connect(partial(onFinished, worker))
+        worker.signals.failed.connect(partial(onFailed, worker))
+
+        #   Keeps a reference until the worker reports back
+        self.activeJobs.append(worker)
+        self.threadPool.start(worker)
+
+
+    @err_catcher(name=__name__)
+    def updateJobProgress(self, progressPopup, num, total, text):
+        try:
+            #   Keeps a cancelled popup from showing again while rolling back
+            if progressPopup.wasCanceled():
+                return
+            progressPopup.setMaximum(total)
+            progressPopup.setValue(num)
+            progressPopup.setLabelText(text)
+        except:
+            pass
+
+
+    @err_catcher(name=__name__)
+    def endJob(self, worker, job):
+        if worker in self.activeJobs:
+            self.activeJobs.remove(worker)
+
+        if "progressPopup" in job:
+            try:
+                job["progressPopup"].close()
+            except:
+                pass
+
+        #   Restore Media Player to orignal state
+        if "mediaViewer" in job:
+            job["mediaViewer"].state = job["viewOrigState"]
+            job["mediaViewer"].updatePreview()
+
+
+    @err_catcher(name=__name__)
+    def onDeleteFinished(self, worker, job):
+        self.endJob(worker, job)
+
+        delItemName = job["delItemName"]
+
+        fileInfo = self.makeFileInfo(job)
+
+        logger.debug(f"SUCCESS: {delItemName} deleted")
+        if job.get("dedupSize"):
+            logger.debug(f"Deduplicated {formatSize(job['dedupSize'])} of {delItemName}")
+
+        #   Ledger entry is only written once all the files have been moved
+        if self.commitLedger("delete", items=[fileInfo]):
+            DeleteTransaction(job["txnFile"]).remove()
+        self.enforceQuota(excludeUIDs=[fileInfo["UID"]])
+        #   Refresh ProjectBrowser
+        self.core.pb.refreshUI()
+
+
+    @err_catcher(name=__name__)
+    def onBatchDeleteFinished(self, worker, batch):
+        self.endJob(worker, batch)
+
+        #   Items with any moved files are recorded, so partially moved items can still be restored
+        fileInfos = []
+        usedUIDs = set()
+        for job in batch["jobs"]:
+            if job["origLocList"]:
+                fileInfo = self.makeFileInfo(job)
+                usedUIDs.add(fileInfo["UID"])
+                fileInfos.append(fileInfo)
+
+        #   Single Ledger write for the whole batch
+        if fileInfos:
+            logger.debug(f"SUCCESS: {len(fileInfos)} items deleted")
+            if self.commitLedger("delete", items=fileInfos):
+                for job in batch["jobs"]:
+                    if job["origLocList"]:
+                        DeleteTransaction(job["txnFile"]).remove()
+            self.enforceQuota(excludeUIDs=usedUIDs)
+
+        for job in batch["failures"]:
+            #   Removes the reserved Delete Dir if nothing was moved into it
+            if not job["origLocList"] and "destDir" in job:
+                for path in [job["destDir"]] + job["volumeDirs"]:
+                    shutil.rmtree(path, ignore_errors=True)
+                DeleteTransaction(job["txnFile"]).remove()
+
+        #   Cancelled items have been rolled back, so are not reported as errors
+        failures = [job for job in batch["failures"] if not isinstance(job["error"], DeleteCancelled)]
+        cancelled = len(batch["failures"]) - len(failures)
+        if cancelled:
+            logger.info(f"Delete cancelled: {cancelled} items rolled back")
+
+        if failures:
+            for job in failures:
+                logger.warning(f"ERROR: Unable to Delete: {job['delItemName']}.  {job['error']}")
+
+            failedNames = "\n".join(f"{job['delItemName']}:  {job['error']}" for job in failures[:20])
+            if len(failures) > 20:
+                failedNames += f"\n.. and {len(failures) - 20} more"
+            self.core.popup(f"Unable to Delete {len(failures)} item(s):\n\n{failedNames}")
+
+        #   Refresh ProjectBrowser
+        self.core.pb.refreshUI()
+
+
+    @err_catcher(name=__name__)
+    def onDeleteFailed(self, worker, job):
+        self.endJob(worker, job)
+
+        delItemName = job["delItemName"]
+        e = job["error"]
+
+        #   Moves that could not be rolled back are kept in the Ledger so they can be restored,
+        #   otherwise the reserved Delete Dir is removed
+        if job.get("origLocList"):
+            if self.commitLedger("delete", items=[self.makeFileInfo(job)]):
+                DeleteTransaction(job["txnFile"]).remove()
+            self.core.pb.refreshUI()
+        elif "destDir" in job:
+            for path in [job["destDir"]] + job["volumeDirs"]:
+                shutil.rmtree(path, ignore_errors=True)
+            DeleteTransaction(job["txnFile"]).remove()
+
+        if isinstance(e, DeleteCancelled):
+            logger.info(f"Delete cancelled: {delItemName} rolled back")
+            return
+
+        if job["type"] == "Product":
+            self.core.popup(f"Unable to Delete: {delItemName}\n\nTry closing the Viewer Window\n\nError:\n\n{e}")
+            logger.warning(f"ERROR: Unable to Delete: {delItemName}\n\nTry closing the Viewer Window\n\nError:\n\n{e}")
+
+        elif job["type"] == "Media":
+            self.core.popup(f"Unable to Delete: {delItemName}\n\nTry disabling the Media Viewer\n\nError:\n\n{e}")
+            logger.warning(f"ERROR: Unable to Delete: {delItemName}\n\nTry disabling the Media Viewer\n\nError:\n\n{e}")
+
+        else:
+            self.core.popup(f"Unable to Delete: {delItemName}\n\n{e}")
+            logger.warning(f"ERROR: Unable to Delete: {delItemName}\n\n{e}")
     
 
     @err_catcher(name=__name__)                 #   TODO MAKE SURE DIRS EXIST -- Maybe do not show the Delete option if not.
@@ -1196,371 +2451,2503 @@ class Prism_DeleteFunctions_Functions(object):
             result = self.core.popupQuestion(questionText, title="Permanently Delete Files")
 
             if result == "Yes":
-                try:
-                    # Iterate over all files and subdirectories in the given directory
-                    for root, dirs, files in os.walk(self.delDirectory, topdown=False):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            os.remove(file_path)
-
-                        for dir_name in dirs:
-                            dir_path = os.path.join(root, dir_name)
-                            shutil.rmtree(dir_path)
-
-                    #   Clear list
-                    self.delFileInfoList = []
-                    logger.debug("SUCCESS:  Purged All Files")
-                    self.saveSettings()
-                    self.refreshList()
-
-                except Exception as e:
-                    logger.warning(f"ERROR: Unable to Purge Files.  {e}")
+                #   Removes every item in the Delete Dir in the background
+                self.syncSettings()
+                self.startPurge(self.ledger.items(), allItems=True)
             else:
                 return
 
-        #   Purges selected item
-        elif mode == "single":
-            selectedRow = self.table_delItems.currentRow()
+        #   Purges selected items
+        elif mode == "selected":
+            selectedUIDs = self.getSelectedUIDs()
             #   Return if no row selected
-            if selectedRow == -1:
+            if not selectedUIDs:
                 return
 
-            questionText = f"Are you sure you want to Permanently Delete the Selected Item?\n\nThis is not Reversible."
+            questionText = (f"Are you sure you want to Permanently Delete the {len(selectedUIDs)} Selected Item(s)?\n\n"
+                            "This is not Reversible."
+                            )
             result = self.core.popupQuestion(questionText, title="Permanently Delete Files")
 
             if result == "Yes":
-                try:
-                    # Deleting selected files in the table
-                    selectedUID = self.table_delItems.item(selectedRow, 4).text()
+                # Find the dictionaries in the Ledger with the matching UIDs
+                purgeItems = [item for item in map(self.getItemFromUID, selectedUIDs) if item]
+
+                if purgeItems:
+                    logger.debug(f"Purging {len(purgeItems)} items")
+                    self.startPurge(purgeItems)
 
-                    # Find the dictionary in the list with the matching UID
-                    purgeItem = self.getItemFromUID(selectedUID)
-                    logger.debug(f"Purging {purgeItem['Entity']}")
+            else:
+                return
 
-                    if purgeItem:
-                        itemPath = purgeItem["DeletedLocation"]
-                        if os.path.exists(itemPath):
-                            shutil.rmtree(itemPath)
 
-                        # Remove the matched item from the list
-                        self.delFileInfoList.remove(purgeItem)
+    #   Purges items on the thread pool and records them in the Ledger as one batch
+    @err_catcher(name=__name__)
+    def startPurge(self, items, allItems=False, showProgress=True, auto=False):
+        #   Skips items that are already being purged or restored, and returns their UIDs
+        busyUIDs = self.getBusyUIDs()
+        skippedUIDs = [item["UID"] for item in items if item["UID"] in busyUIDs]
+        items = [item for item in items if item["UID"] not in busyUIDs]
+        if not items and not allItems:
+            return skippedUIDs
+
+        UIDs = [item["UID"] for item in items]
+        self.purgingUIDs.update(UIDs)
+
+        job = {"targets": [(path, item["UID"]) for item in items for path in getItemPaths(item)],
+               "UIDs": UIDs,
+               "allItems": allItems,
+               "auto": auto,
+               "delDirectory": self.delDirectory,
+               "keepPaths": self.getReservedPaths() if allItems else []
+               }
+
+        self.startJob(PurgeWorker(job),
+                      "Purging Deleted items - please wait..",
+                      len(items),
+                      self.onPurgeFinished,
+                      self.onPurgeFailed,
+                      showProgress=showProgress
+                      )
+
+        return skippedUIDs
+
+
+    #   Returns the paths of items that are being restored or archived, and the Dirs reserved
+    #   by deletes that are still moving files.  These are kept by Purge All
+    @err_catcher(name=__name__)
+    def getReservedPaths(self):
+        paths = []
+        for UID in self.restoringUIDs | self.archivingUIDs:
+            item = self.ledger.get(UID)
+            if not item:
+                continue
+            paths += getItemPaths(item)
+
+            #   Archive that is being written
+            if UID in self.archivingUIDs:
+                for archiveFormat in ArchiveWorker.formats:
+                    archivePath = ArchiveWorker.getArchivePath(item, archiveFormat)
+                    paths += [archivePath, archivePath + ".tmp"]
+
+        for worker in self.activeJobs:
+            if not isinstance(worker, DeleteWorker):
+                continue
+            #   Batch deletes hold one job for each item
+            for job in worker.job.get("jobs", [worker.job]):
+                if "destDir" in job:
+                    paths += [job["destDir"]] + list(job["volumeDirs"])
+
+        return paths
 
-                        logger.debug(f"SUCCESS: Purged {purgeItem['Entity']}")
-                        self.saveSettings()
-                        self.refreshList()
 
-                except Exception as e:
-                    logger.warning(f"ERROR: Unable to Purge {purgeItem['Entity']}.  {e}")
+    @err_catcher(name=__name__)
+    def onPurgeFinished(self, worker, job):
+        self.endJob(worker, job)
+        self.purgingUIDs.difference_update(job["UIDs"])
 
+        failures = job["failures"]
+
+        #   Single Ledger write for the whole batch.  Only the purged items are removed,
+        #   as items added while purging are not in the job
+        if job["purgedUIDs"]:
+            logger.debug(f"SUCCESS:  Purged {len(job['purgedUIDs'])} items")
+            self.commitLedger("purge", UIDs=job["purgedUIDs"])
+
+        if failures:
+            for path, UID, error in failures:
+                logger.warning(f"ERROR: Unable to Purge {path}.  {error}")
+
+            if job["auto"]:
+                self.autoPurger.requeue([UID for path, UID, error in failures if UID])
             else:
-                return
+                failedNames = "\n".join(os.path.basename(path) for path, UID, error in failures[:20])
+                if len(failures) > 20:
+                    failedNames += f"\n.. and {len(failures) - 20} more"
+                self.core.popup(f"Unable to Purge {len(failures)} item(s):\n\n{failedNames}")
+
+
+    @err_catcher(name=__name__)
+    def onPurgeFailed(self, worker, job):
+        self.endJob(worker, job)
+        self.purgingUIDs.difference_update(job["UIDs"])
+
+        logger.warning(f"ERROR: Unable to Purge Files.  {job['error']}")
 
 
-    @err_catcher(name=__name__)                             #   TODO MORE ROBUST FILE CHECKING BEFORE DELETE
+    @err_catcher(name=__name__)
     def restoreSelected(self):
 
-        selectedRow = self.table_delItems.currentRow()
+        selectedUIDs = self.getSelectedUIDs()
         #   Return if no row selected
-        if selectedRow == -1:
+        if not selectedUIDs:
             return
 
-        questionText = (f"Are you sure you want to Restore the selected Entity to the original location?\n\n"
-                        "The restore may overwrite any files with the same name as the deleted files."                  #   TODO TEXT ABOUT RESTORE.
+        questionText = (f"Are you sure you want to Restore the {len(selectedUIDs)} selected Entities to the original location?\n\n"
+                        "Entities with files that already exist in the original location will not be restored."
                         )
         title = "Restore Entity"
         result = self.core.popupQuestion(questionText, title=title)
 
         if result == "Yes":
-            # Retrieving UID from hidden table column
-            selectedUID = self.table_delItems.item(selectedRow, 4).text()
+            # Find the dictionaries in the Ledger with the matching UIDs
+            restoreItems = [item for item in map(self.getItemFromUID, selectedUIDs)
+                            if item and item["UID"] not in self.getBusyUIDs()]
+            if not restoreItems:
+                return
 
-            # Find the dictionary in the list with the matching UID
-            restoreEntity = self.getItemFromUID(selectedUID)
-            origList = restoreEntity["OriginalLocation"]
+            logger.debug(f"Restoring {len(restoreItems)} items")
 
-            if restoreEntity:
-                logger.debug(f"Restoring {restoreEntity['Entity']}")
+            UIDs = [item["UID"] for item in restoreItems]
+            self.restoringUIDs.update(UIDs)
 
-                restorePopup = self.core.waitPopup(
-                    self.core, "Restoring Entity - please wait..\n\n\n"
-                    )
+            job = {"items": restoreItems,
+                   "UIDs": UIDs
+                   }
 
-                restorePopup.show()
+            self.startJob(RestoreWorker(job, self.moveEngine),
+                          "Restoring Entities - please wait..",
+                          len(restoreItems),
+                          self.onRestoreFinished,
+                          self.onRestoreFailed
+                          )
 
-                try:
-                    #   For case where restoring files to a Dir
-                    if restoreEntity["Type"] in ["Scene Files", "Library Item"]:                  #   TODO CLEANUP
-                        for origItem in origList:
-                            origLocName = origItem["location"]
-                            origLocPath = origItem["path"]
-                            origLocDir = os.path.dirname(origLocPath)
-                            delLocBase = restoreEntity["DeletedLocation"]
-                            delLocation = os.path.join(delLocBase, origLocName)
-                            
-                            if not os.path.exists(origLocDir):
-                                os.mkdir(origLocDir)
-                            
-                            for item in os.listdir(delLocation):
-                                delItemPath = os.path.join(delLocation, item)
-                                origItemPath = os.path.join(origLocDir, item)
-
-                                #   If file exists it will abort
-                                if os.path.isfile(origItemPath):
-                                    logger.debug(f"Unable to Restore--Item already exists:  {restoreEntity['Entity']}")
-                                    title = "Unable to Restore"
-                                    text = (f"{restoreEntity['Type']}: {item}\n\n"
-                                            "already exists in Restore Location." 
-                                            )
-                                    self.core.popup(text=text, title=title)
-                                    return
-
-                            for item in os.listdir(delLocation):
-                                delItemPath = os.path.join(delLocation, item)
-                                origItemPath = os.path.join(origLocDir, item)                           
-                                try:
-                                    shutil.move(delItemPath, origLocDir)
-                                except Exception as e:
-                                    self.core.popup(f"{e}")
-                                    logger.debug(f"Restore Error: {e}")
 
-                    else:
-                        #   For case that resore entire Dir
-                        for origItem in origList:
-                            origLocName = origItem["location"]
-                            origLocPath = origItem["path"]
-                            delLocBase = restoreEntity["DeletedLocation"]
-                            delLocation = os.path.join(delLocBase, origLocName)
-
-                            if not os.path.exists(origLocPath):
-                                os.mkdir(origLocPath)
-                            
-                            for item in os.listdir(delLocation):
-                                delItemPath = os.path.join(delLocation, item)
-                                origItemPath = os.path.join(origLocPath, item)
-
-                                #   If file exists it will abort
-                                if os.path.exists(origItemPath):
-                                    logger.debug(f"Unable to Restore--Item already exists:  {restoreEntity['Entity']}")
-                                    title = "Unable to Restore"
-                                    text = (f"{restoreEntity['Type']}\n\n"
-                                            "already exists in Restore Location."
-                                            )
-                                    self.core.popup(text=text, title=title)
-                                    return
-                                try:
-                                    shutil.move(delItemPath, origLocPath)
-                                except Exception as e:
-                                    self.core.popup(f"{e}")
-                                    logger.debug(f"Restore Error: {e}")
-
-                    #   Remove item from table
-                    self.table_delItems.removeRow(selectedRow)
-
-                    # Remove the matched item from the list
-                    self.delFileInfoList.remove(restoreEntity)
-
-                    if os.path.exists(delLocBase):
-                        shutil.rmtree(delLocBase)
-
-                    logger.debug(f"SUCCESS: Restored {restoreEntity['Entity']}")
-                    self.saveSettings()
-                    self.calcDelDirSize()
-                    self.core.pb.refreshUI()
+    @err_catcher(name=__name__)
+    def onRestoreFinished(self, worker, job):
+        self.endJob(worker, job)
+        self.restoringUIDs.difference_update(job["UIDs"])
+
+        #   Single Ledger write for the whole batch
+        if job["restoredUIDs"]:
+            logger.debug(f"SUCCESS: Restored {len(job['restoredUIDs'])} items")
+            self.commitLedger("restore", UIDs=job["restoredUIDs"])
+            self.core.pb.refreshUI()
+
+        messages = []
+
+        if job["conflicts"]:
+            messages.append("Already exist in Restore Location:\n")
+            for entity, names in job["conflicts"][:20]:
+                logger.debug(f"Unable to Restore--Item already exists:  {entity}")
+                messages.append(f"{entity}:  {', '.join(names[:5])}" + (" .." if len(names) > 5 else ""))
+            if len(job["conflicts"]) > 20:
+                messages.append(f".. and {len(job['conflicts']) - 20} more")
+
+        if job["failures"]:
+            if messages:
+                messages.append("")
+            messages.append("Errors:\n")
+            for entity, error in job["failures"][:20]:
+                logger.warning(f"ERROR: Unable to Restore {entity}: {error}")
+                messages.append(f"{entity}:  {error}")
+            if len(job["failures"]) > 20:
+                messages.append(f".. and {len(job['failures']) - 20} more")
+
+        if messages:
+            failedCount = len(job["conflicts"]) + len(job["failures"])
+            self.core.popup(text=f"Unable to Restore {failedCount} item(s):\n\n" + "\n".join(messages),
+                            title="Unable to Restore"
+                            )
 
-                except Exception as e:
-                    logger.warning(f"ERROR: Unable to Restore: {e}")
 
-                restorePopup.close()
+    @err_catcher(name=__name__)
+    def onRestoreFailed(self, worker, job):
+        self.endJob(worker, job)
+        self.restoringUIDs.difference_update(job["UIDs"])
+
+        logger.warning(f"ERROR: Unable to Restore: {job['error']}")
+
+
+    #   Finds deletes that were interrupted, and resumes the finished ones or rolls back the rest
+    @err_catcher(name=__name__)
+    def recoverTransactions(self):
+        try:
+            txnFiles = [os.path.join(self.transactionDir, name) for name in os.listdir(self.transactionDir)
+                        if name.endswith(".jsonl")]
+        except FileNotFoundError:
+            return
+
+        hostName = socket.gethostname()
+        resumed = []
+        rollbacks = []
+        for txnFile in txnFiles:
+            txn = DeleteTransaction(txnFile)
+            try:
+                record = txn.read()
+            except (OSError, ValueError) as e:
+                logger.warning(f"ERROR: Unable to read Delete Transaction {txnFile}:  {e}")
+                continue
+
+            plan = record["plan"]
+            #   Leaves deletes that are still running in another Prism session
+            if plan["host"] != hostName:
+                continue
+            if plan["pid"] != os.getpid() and isProcessRunning(plan["pid"]):
+                continue
+
+            job = record["job"]
+            #   Ledger was written, only the journal was left behind
+            if self.ledger.get(job["UID"]):
+                txn.remove()
+            #   Every file was moved, so the delete is finished
+            elif len(job["origLocList"]) == plan["steps"]:
+                resumed.append((txn, job))
             else:
-                pass
+                rollbacks.append(record)
+
+        if resumed:
+            logger.info(f"Resuming {len(resumed)} interrupted deletes")
+            if self.commitLedger("delete", items=[self.makeFileInfo(job) for txn, job in resumed]):
+                for txn, job in resumed:
+                    txn.remove()
+
+        if rollbacks:
+            logger.info(f"Rolling back {len(rollbacks)} interrupted deletes")
+            job = {"records": rollbacks}
+            self.startJob(RollbackWorker(job, self.moveEngine),
+                          "Rolling back interrupted deletes..",
+                          len(rollbacks),
+                          self.onRollbackFinished,
+                          self.onRollbackFailed,
+                          showProgress=False
+                          )
 
 
     @err_catcher(name=__name__)
-    def generateUID(self):
-        #   Generate UID using current datetime to the nearest tenth of a second
-        currentDatetime = datetime.now()
-        UID = currentDatetime.strftime("%m%d%y%H%M%S") + str(currentDatetime.microsecond // 100000)
+    def onRollbackFinished(self, worker, job):
+        self.endJob(worker, job)
+
+        for delItemName in job["rolledBack"]:
+            logger.info(f"Rolled back interrupted delete: {delItemName}")
+
+        if job["failures"]:
+            for delItemName, error in job["failures"]:
+                logger.warning(f"ERROR: Unable to roll back {delItemName}.  {error}")
 
-        logger.debug("Creating UID")
+            failedNames = "\n".join(f"{delItemName}:  {error}" for delItemName, error in job["failures"][:20])
+            self.core.popup(f"Unable to roll back {len(job['failures'])} interrupted delete(s).\n"
+                            f"The journals are kept in:\n{self.transactionDir}\n\n{failedNames}")
 
-        return UID
+
+    @err_catcher(name=__name__)
+    def onRollbackFailed(self, worker, job):
+        self.endJob(worker, job)
+
+        logger.warning(f"ERROR: Unable to roll back interrupted deletes.  {job['error']}")
 
 
     @err_catcher(name=__name__)
     def ensureDirName(self, delItemName):
 
-        #   Checks if Dir name already exists, and will append _# if it does
+        #   Creates the Dir with an exclusive mkdir, and will append _# if the name is taken
         destDir = os.path.join(self.delDirectory, delItemName)
 
-        if not os.path.exists(destDir):
+        try:
             os.mkdir(destDir)
             logger.debug(f"Creating Deleted Item: {delItemName}")
-        else:
-            #   Checks if an appened deleted item already exists
-            match = re.match(r"_(\d+)$", destDir)
-            if match:
-                baseDir = match.group(1)
-            else:
-                baseDir = destDir
+            return destDir, delItemName
+        except FileExistsError:
+            pass
 
-            #   Appends suffix
-            newSuffix = 0
-            while os.path.exists(destDir):
-                newSuffix += 1
-                destDir = f"{baseDir}_{newSuffix}"
+        #   Next suffix comes from the counters, and mkdir is retried for Dirs not in the Ledger
+        counters = self.getDirNameCounters()
+        newSuffix = counters.get(delItemName, 0)
+        while True:
+            newSuffix += 1
+            destDir = os.path.join(self.delDirectory, f"{delItemName}_{newSuffix}")
+            try:
+                os.mkdir(destDir)
+                break
+            except FileExistsError:
+                continue
 
-            delItemName = f"{delItemName}_{newSuffix}"
-            os.mkdir(destDir)
+        counters[delItemName] = newSuffix
+        delItemName = f"{delItemName}_{newSuffix}"
 
-            logger.debug(f"Item already exists in Delete Dir.  Creating duplicate: {delItemName}")
+        logger.debug(f"Item already exists in Delete Dir.  Creating duplicate: {delItemName}")
 
         return destDir, delItemName
+
+
+    #   Returns the highest _# suffix used for each Deleted item name, built once from the Ledger
+    @err_catcher(name=__name__)
+    def getDirNameCounters(self):
+        if self.dirNameCounters is None:
+            self.dirNameCounters = {}
+            for item in self.ledger.items():
+                match = re.fullmatch(r"(.+)_(\d+)", os.path.basename(os.path.normpath(item["DeletedLocation"])))
+                if match:
+                    baseName, suffix = match.group(1), int(match.group(2))
+                    self.dirNameCounters[baseName] = max(self.dirNameCounters.get(baseName, 0), suffix)
+
+        return self.dirNameCounters
     
 
     @err_catcher(name=__name__)
     def getItemFromUID(self, UID): 
         #   Returns full item details from matching UID
         try:  
-            selectedItem = next((item for item in self.delFileInfoList if item["UID"] == UID), None)
-            return selectedItem
+            return self.ledger.get(UID)
         except:
             return None
     
 
     @err_catcher(name=__name__)
     def refreshList(self):
-        #   To resync table in menu
-        self.table_delItems.clearContents()
-
-        #   Checks if item exists in DeleteDir and removes from list
-        updated_delFileInfoList = []
-        for item in self.delFileInfoList:
-            if os.path.exists(item["DeletedLocation"]):
-                updated_delFileInfoList.append(item)
-    
-        self.delFileInfoList = updated_delFileInfoList
+        #   To resync table in menu.  Scans the Delete Dir in the background
+        if self.scanRunning:
+            return
+
+        self.syncSettings()
+
+        logger.debug("Scanning Delete Dir")
+        self.scanRunning = True
+
+        job = {"delDirectory": self.delDirectory,
+               "trashRoots": self.getUsedTrashRoots(),
+               #   Paths of the items in the Ledger when the scan started
+               "itemPaths": {item["UID"]: getItemPath(item) for item in self.ledger.items()}
+               }
+        worker = TrashScanner(job, self.scanCache)
+        #   Streams the running total into the menu as items are scanned
+        worker.signals.result.connect(self.onScanProgress)
+
+        self.startJob(worker,
+                      "Scanning Delete Dir..",
+                      0,
+                      self.onScanFinished,
+                      self.onScanFailed,
+                      showProgress=False
+                      )
+
 
+    @err_catcher(name=__name__)
+    def onScanProgress(self, partialTotal):
+        try:
+            self.e_tempDirSize.setText(f"{formatSize(partialTotal)} ..")
+        except:
+            pass
+
+
+    @err_catcher(name=__name__)
+    def onScanFinished(self, worker, job):
+        self.endJob(worker, job)
+        self.scanRunning = False
+
+        results = job["results"]
+
+        #   Removes items that no longer exist in the DeleteDir, and updates changed sizes.
+        #   Items added, archived or worked on since the scan started are left as they are
+        busyUIDs = self.getBusyUIDs()
+        missingUIDs = []
+        updatedItems = []
+        for item in self.ledger.items():
+            if item["UID"] in busyUIDs or job["itemPaths"].get(item["UID"]) != getItemPath(item):
+                continue
+
+            scanResult = results.get(TrashScanner.getKey(getItemPath(item)))
+            if scanResult is None:
+                missingUIDs.append(item["UID"])
+            else:
+                itemSize, fileCount = scanResult
+                #   Adds the item Dirs in the trash roots of other volumes
+                for volumeDir in item.get("VolumeDirs", []):
+                    volumeSize, volumeCount = results.get(TrashScanner.getKey(volumeDir), (0, 0))
+                    itemSize += volumeSize
+                    fileCount += volumeCount
+                #   File count of an archive is kept from when it was archived
+                if item.get("Archive"):
+                    fileCount = item.get("FileCount")
+                if item.get("Size") != itemSize or item.get("FileCount") != fileCount:
+                    updatedItems.append(dict(item, Size=itemSize, FileCount=fileCount))
+
+        if missingUIDs:
+            self.ledger.record("purge", UIDs=missingUIDs)
+        if updatedItems:
+            self.ledger.record("update", items=updatedItems)
+
+        #   Writes a fresh snapshot
         self.saveSettings()
-        self.loadSettings()
-        self.calcDelDirSize()
-        self.table_delItems.viewport().update()
         logger.debug("Delete Dir List Refreshed")
 
 
+    @err_catcher(name=__name__)
+    def onScanFailed(self, worker, job):
+        self.endJob(worker, job)
+        self.scanRunning = False
+
+        logger.warning(f"ERROR: Unable to scan Delete Dir:  {job['error']}")
+        self.calcDelDirSize()
+
+
     @err_catcher(name=__name__)
     def calcDelDirSize(self):
-        totalSize = 0
+        #   Uses the sizes recorded in the Ledger instead of walking the Delete Dir
         try:
-            for dirpath, dirnames, filenames in os.walk(self.delDirectory):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    totalSize += os.path.getsize(filepath)
-
-            # Convert bytes to appropriate unit and round to the nearest tenth
-            if totalSize < 1024 * 1024:
-                delDirSize = round(totalSize / 1024*2, 1)
-                unit = "KB"
-            elif totalSize >= 1024**3:
-                delDirSize = round(totalSize / (1024**3), 1)
-                unit = "GB"
-            else:
-                delDirSize = round(totalSize / (1024 * 1024), 1)
-                unit = "MB"
+            totalSize, unmeasured = self.ledger.totalSize()
+
+            delDirSizeStr = formatSize(totalSize)
+            #   Items deleted before sizes were recorded are measured with ReSync
+            if unmeasured:
+                delDirSizeStr += " +"
 
-            delDirSizeStr = f"{delDirSize} {unit}"
             self.e_tempDirSize.setText(delDirSizeStr)
         except:
             pass
 
 
 
-class AutoPurger(object):
+class DeletedItemsModel(QAbstractTableModel):
 
-    timerRunning = False
+    columns = ["Project", "Type", "Entity", "Deleted", "UID"]
 
-    def __init__(self, core, settingsFile, delDirectory):
-        super().__init__()
+    #   Number of rows added each time the view scrolls to the end
+    fetchBatchSize = 500
 
-        self.core = core
-        #   Timer for directory check
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.checkDir)
+    def __init__(self, parent=None):
+        super().__init__(parent)
 
-        #   Interval for AutoPurger to check DeleteDir for purge items.
-        #   This is NOT the duration to keep the items before purging
-        self.dirCheckInterval = 600  # seconds  (10 mins)
-        
+        #   All Ledger items, newest first
+        self.itemList = []
+        self.fetchedCount = 0
+
+
+    def setItems(self, items):
+        self.beginResetModel()
+        self.itemList = sorted(items, key=getDeletedTime, reverse=True)
+        self.fetchedCount = min(self.fetchBatchSize, len(self.itemList))
+        self.endResetModel()
+
+
+    def addItems(self, items):
+        #   New items are the newest so are inserted at the top
+        if not items:
+            return
+
+        self.beginInsertRows(QModelIndex(), 0, len(items) - 1)
+        self.itemList[0:0] = sorted(items, key=getDeletedTime, reverse=True)
+        self.fetchedCount += len(items)
+        self.endInsertRows()
+
+
+    def updateItems(self, items):
+        updatedItems = {item["UID"]: item for item in items}
+
+        for row, item in enumerate(self.itemList):
+            if item["UID"] in updatedItems:
+                self.itemList[row] = updatedItems[item["UID"]]
+                if row < self.fetchedCount:
+                    self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+
+
+    def removeUIDs(self, UIDs):
+        UIDs = set(UIDs)
+
+        #   Removes from the end so the row numbers stay valid
+        for row in reversed(range(len(self.itemList))):
+            if self.itemList[row]["UID"] not in UIDs:
+                continue
+
+            if row < self.fetchedCount:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.itemList[row]
+                self.fetchedCount -= 1
+                self.endRemoveRows()
+            else:
+                del self.itemList[row]
+
+
+    def getUID(self, row):
+        return self.itemList[row]["UID"]
+
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return self.fetchedCount
+
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.columns)
+
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        item = self.itemList[index.row()]
+        column = self.columns[index.column()]
+
+        if role == Qt.DisplayRole:
+            return item.get(column, "")
+
+        #   Used by the proxy for sorting
+        elif role == Qt.UserRole:
+            if column == "Deleted":
+                return getDeletedTime(item)
+            return item.get(column, "")
+
+        return None
+
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return None
+
+        if role == Qt.DisplayRole:
+            return self.columns[section]
+        elif role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+
+        return None
+
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+
+        return self.fetchedCount < len(self.itemList)
+
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+
+        count = min(self.fetchBatchSize, len(self.itemList) - self.fetchedCount)
+        if count <= 0:
+            return
+
+        self.beginInsertRows(QModelIndex(), self.fetchedCount, self.fetchedCount + count - 1)
+        self.fetchedCount += count
+        self.endInsertRows()
+
+
+    def fetchAll(self):
+        count = len(self.itemList) - self.fetchedCount
+        if count <= 0:
+            return
+
+        self.beginInsertRows(QModelIndex(), self.fetchedCount, len(self.itemList) - 1)
+        self.fetchedCount = len(self.itemList)
+        self.endInsertRows()
+
+
+
+class SettingsCache(object):
+
+    def __init__(self, settingsFile):
         self.settingsFile = settingsFile
-        self.delDirectory = delDirectory
 
-        #   Stops timer thread when Prism is quitting
-        QCoreApplication.instance().aboutToQuit.connect(self.stop)
+        #   (mtime, size) of the file when it was last parsed
+        self.signature = None
+        self.data = None
 
 
-    def checkDir(self):
-        logger.info(f"AutoPurge--Checking directory: {self.delDirectory}")
+    def getSignature(self):
+        try:
+            stat = os.stat(self.settingsFile)
+        except FileNotFoundError:
+            return None
 
-        #   Calculates cutoff time based on interval and present time
-        delTimeCutoff_str = self.getDelTimeCutoff()
-        logger.debug(f"Files older than {delTimeCutoff_str} will be purged.")
+        return (stat.st_mtime_ns, stat.st_size)
 
-        #   Deletes the deleted files
-        self.executePurge(delTimeCutoff_str)
 
-        # Schedule the next check only if the timer hasn't been started by another instance
-        if not AutoPurger.timerRunning:
-            logger.debug(f"Next AutoPurge check in {self.dirCheckInterval / 60} mins.")
-            self.timer.start(self.dirCheckInterval * 1000)  # Convert seconds to milliseconds
-            AutoPurger.timerRunning = True
+    def isStale(self):
+        #   Returns True if the file on disk differs from the cached data
+        signature = self.getSignature()
+        return self.data is None or signature is None or signature != self.signature
 
 
-    def getDelTimeCutoff(self):
-        #   Returns the date/time based on the hours interval selected in the menu
-        currentDateTime = datetime.now()
-        delTimeCutoff = currentDateTime - timedelta(hours=self.deleteInterval)
-        delTimeCutoff_str = delTimeCutoff.strftime('%m/%d/%y %H:%M')
+    def read(self):
+        #   Returns the cached data, and only re-parses if the file has changed
+        signature = self.getSignature()
+        if signature is None:
+            self.data = None
+            raise FileNotFoundError(self.settingsFile)
+
+        if self.data is None or signature != self.signature:
+            logger.debug("Settings file changed on disk.  Parsing settings file.")
+            with open(self.settingsFile, "r") as json_file:
+                self.data = json.load(json_file)
+            self.signature = signature
+
+        return self.data
+
+
+    def update(self, data):
+        #   Used after writing the file so the written data does not need to be parsed again
+        self.data = data
+        self.signature = self.getSignature()
+
+
+    def clear(self):
+        self.data = None
+        self.signature = None
+
+
+
+class DeleteLedger(object):
+
+    def __init__(self, journalFile, compactThreshold=200, settingsFile=None):
+        self.journalFile = journalFile
+        #   Own cache of the settings file, so the plugin's cache still sees the other
+        #   changed settings after the Ledger reloads the snapshot
+        self.snapshotCache = SettingsCache(settingsFile) if settingsFile else None
+        #   Signature of the snapshot the Ledger was built from
+        self.snapshotSignature = None
+        #   Journals moved aside by compaction, removed once the snapshot is written -
+        #   {path: bytes applied}
+        self.rotatedFiles = {}
+
+        #   Number of journal entries before the journal is compacted into the settings file
+        self.compactThreshold = compactThreshold
+
+        #   Deleted items keyed by UID (dicts keep insertion order)
+        self.itemDict = {}
+
+        #   Running total of the recorded item sizes
+        self.sizeTotal = 0
+        self.unmeasured = 0
+
+        #   Deduplicated files - hash: [size, {(UID, relative path): path}].  Bytes of files
+        #   that are hardlinks to another file are not counted in the total size
+        self.blobRefs = {}
+        self.sharedSize = 0
+
+        #   Bytes of the journal that have already been applied
+        self.journalOffset = 0
+        self.journalEntries = 0
+        #   First line of the journal, changes when another session rotates it
+        self.journalHead = None
+
+
+    def load(self, snapshotItems, snapshotSignature=None):
+        #   Rebuilds from the settings file snapshot and replays the whole journal
+        self.itemDict = {}
+        self.sizeTotal = 0
+        self.unmeasured = 0
+        self.blobRefs = {}
+        self.sharedSize = 0
+        for item in snapshotItems:
+            self.addItem(item)
+
+        self.snapshotSignature = snapshotSignature
+
+        #   Journals left by a compaction that did not finish writing the snapshot
+        rotatedFiles = sorted(glob.glob(glob.escape(self.journalFile) + ".*.old"), key=os.path.getmtime)
+        for rotatedFile in rotatedFiles:
+            self.journalOffset = 0
+            self.readJournal(rotatedFile)
+            self.rotatedFiles[rotatedFile] = self.journalOffset
+
+        self.journalOffset = 0
+        self.journalEntries = 0
+        self.journalHead = None
+        self.readJournal()
+
+
+    def sync(self):
+        #   Applies entries appended by other Prism sessions.  Costs two stats if nothing changed
+
+        #   Another session compacted the journal into a new snapshot, and started a new journal
+        if self.snapshotCache:
+            signature = self.snapshotCache.getSignature()
+            if signature != self.snapshotSignature:
+                try:
+                    data = self.snapshotCache.read()
+                except (OSError, ValueError):
+                    data = None
+
+                #   Snapshot of a session that switched to SQLite is loaded by loadSettings
+                if data and data.get("Ledger Backend", "JSON") == "JSON":
+                    self.load(data.get("Items", []), self.snapshotCache.signature)
+                    #   More than one, so the whole table is reloaded
+                    return max(len(self.itemDict), 2)
+
+        #   Journal was rotated by a compaction that has not written the snapshot yet.  The rest of
+        #   the old journal is replayed from the rotated files, then the new journal from the start
+        if self.journalHead is not None and self.readHead() != self.journalHead:
+            logger.debug("Delete Journal was rotated by another session.")
+            rotatedFiles = sorted(glob.glob(glob.escape(self.journalFile) + ".*.old"), key=os.path.getmtime)
+            for rotatedFile in rotatedFiles:
+                self.journalOffset = 0
+                self.readJournal(rotatedFile)
+
+            self.journalOffset = 0
+            self.journalEntries = 0
+            self.journalHead = None
+            return max(self.readJournal(), 2)
 
-        return delTimeCutoff_str
+        try:
+            journalSize = os.path.getsize(self.journalFile)
+        except FileNotFoundError:
+            journalSize = 0
+
+        if journalSize == self.journalOffset:
+            return 0
+
+        return self.readJournal()
 
 
-    def executePurge(self, delTimeCutoff_str):
-        #   Opens settingsFile
-        with open(self.settingsFile, 'r') as file:
-            data = json.load(file)
+    def rotate(self):
+        #   Moves the journal aside before compacting, and applies the entries left in it
+        self.sync()
+
+        rotatedFile = f"{self.journalFile}.{os.getpid()}.{time.time_ns()}.old"
+        try:
+            os.replace(self.journalFile, rotatedFile)
+        except FileNotFoundError:
+            return
 
-        itemsList = data.get("Items", [])
+        self.readJournal(rotatedFile)
+        self.rotatedFiles[rotatedFile] = self.journalOffset
 
-        #   Retrieves item deleted times
-        itemsToDelete = []
-        for item in itemsList:
-            deletedTime_str = item.get("Deleted", "")
+        self.journalOffset = 0
+        self.journalEntries = 0
+        self.journalHead = None
 
-            # Convert the "Deleted" date strings to datetime
-            delTimeCutoff = datetime.strptime(delTimeCutoff_str, '%m/%d/%y %H:%M')
-            deletedTime = datetime.strptime(deletedTime_str, '%m/%d/%y %H:%M')
 
-            # Check if the item's "Deleted" date is less than delTimeCutoff
-            if deletedTime < delTimeCutoff:
-                itemsToDelete.append(item)
+    def compacted(self, snapshotSignature):
+        #   Called once the snapshot with the rotated entries has been written
+        self.snapshotSignature = snapshotSignature
 
-        for item in itemsToDelete:
+        for rotatedFile, offset in self.rotatedFiles.items():
             try:
-                #   Delete matching items
-                logger.debug(f"Purging: {item['DeletedLocation']}")
-                shutil.rmtree(item['DeletedLocation'])
-                logger.info(f"SUCCESS: Purged {item['DeletedLocation']}")
+                self.carryLateEntries(rotatedFile, offset)
+                os.remove(rotatedFile)
+            except FileNotFoundError:
+                pass
+        self.rotatedFiles = {}
 
-                # Remove the deleted item from the data dictionary
-                itemsList.remove(item)
 
-            except Exception as e:
-                logger.warning(f"Unable to purge: {item['DeletedLocation']}")
-                logger.warning(e)
+    def carryLateEntries(self, rotatedFile, offset):
+        #   Sessions that opened the journal before it was rotated append to the rotated file.
+        #   Those entries are not in the snapshot, so they are moved to the new journal
+        with open(rotatedFile, "rb") as journal:
+            journal.seek(offset)
+            data = journal.read()
+
+        #   Only complete lines
+        data = data[:data.rfind(b"\n") + 1]
+        if not data.strip():
+            return
+
+        logger.debug("Moving late entries of a rotated Delete Journal to the new journal.")
+        with open(self.journalFile, "ab") as journal:
+            journal.write(data)
+            journal.flush()
+            os.fsync(journal.fileno())
+
+
+    def readHead(self):
+        try:
+            with open(self.journalFile, "rb") as journal:
+                return journal.readline(4096)
+        except FileNotFoundError:
+            return None
+
+
+    def readJournal(self, journalFile=None):
+        try:
+            with open(journalFile or self.journalFile, "rb") as journal:
+                journal.seek(self.journalOffset)
+                data = journal.read()
+        except FileNotFoundError:
+            return 0
+
+        applied = 0
+        lines = data.split(b"\n")
+
+        #   Remembers the first complete line of the current journal
+        if journalFile is None and self.journalOffset == 0 and len(lines) > 1:
+            self.journalHead = (lines[0] + b"\n")[:4096]
+
+        #   Last element is either empty or a partially written line
+        for line in lines[:-1]:
+            self.journalOffset += len(line) + 1
+
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping unreadable Delete Journal entry.")
+                continue
+
+            self.applyEntry(entry)
+            self.journalEntries += 1
+            applied += 1
+
+        #   Number of entries applied
+        return applied
+
+
+    def applyEntry(self, entry):
+        op = entry.get("op")
+
+        if op in ["delete", "update"]:
+            for item in entry.get("items", []):
+                self.addItem(item)
+
+        elif op in ["restore", "purge"]:
+            if entry.get("all"):
+                self.itemDict = {}
+                self.sizeTotal = 0
+                self.unmeasured = 0
+                self.blobRefs = {}
+                self.sharedSize = 0
+            for UID in entry.get("UIDs", []):
+                self.removeItem(UID)
+
+
+    def addItem(self, item):
+        #   Replaces an existing item with the same UID, keeping its position
+        self.removeSize(self.itemDict.get(item["UID"]))
+        self.itemDict[item["UID"]] = item
+
+        if "Size" in item:
+            self.sizeTotal += item["Size"]
+        else:
+            self.unmeasured += 1
+
+        for relPath, (fileHash, size) in item.get("Blobs", {}).items():
+            refs = self.blobRefs.setdefault(fileHash, [size, {}])[1]
+            if refs:
+                self.sharedSize += size
+            refs[(item["UID"], relPath)] = os.path.join(item["DeletedLocation"], relPath)
+
+
+    def removeItem(self, UID):
+        self.removeSize(self.itemDict.pop(UID, None))
+
+
+    def removeSize(self, item):
+        if item is None:
+            return
+
+        if "Size" in item:
+            self.sizeTotal -= item["Size"]
+        else:
+            self.unmeasured -= 1
+
+        #   Data of a shared file is only freed with its last reference
+        for relPath, (fileHash, size) in item.get("Blobs", {}).items():
+            refs = self.blobRefs.get(fileHash, [0, {}])[1]
+            if refs.pop((item["UID"], relPath), None) is None:
+                continue
+            if refs:
+                self.sharedSize -= size
+            else:
+                del self.blobRefs[fileHash]
+
+
+    def record(self, op, items=None, UIDs=None, allItems=False):
+        #   Appends one line to the journal
+        entry = {"op": op, "time": datetime.now().isoformat()}
+        if items:
+            entry["items"] = items
+        if UIDs:
+            entry["UIDs"] = UIDs
+        if allItems:
+            entry["all"] = True
+
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with open(self.journalFile, "ab") as journal:
+            journal.write(line.encode("utf-8"))
+            journal.flush()
+            os.fsync(journal.fileno())
+
+        #   Reads back the new entry along with any entries from other sessions
+        return self.sync()
+
+
+    def truncate(self):
+        #   Called once the entries have been moved to the SQLite index
+        with open(self.journalFile, "wb"):
+            pass
+
+        self.journalOffset = 0
+        self.journalEntries = 0
+        self.journalHead = None
+        self.compacted(self.snapshotSignature)
+
+
+    def needsCompaction(self):
+        return self.journalEntries >= self.compactThreshold
+
+
+    def items(self):
+        return list(self.itemDict.values())
+
+
+    def get(self, UID):
+        return self.itemDict.get(UID)
+
+
+    def expired(self, cutoff):
+        #   Returns items deleted before the cutoff (epoch seconds)
+        return [item for item in self.itemDict.values() if getDeletedTime(item) < cutoff]
+
+
+    def totalSize(self):
+        #   Returns (bytes, number of items without a recorded size)
+        return self.sizeTotal - self.sharedSize, self.unmeasured
+
+
+    def blobIndex(self):
+        #   Returns {hash: (size, path)} with one path for each deduplicated file
+        return {fileHash: (size, next(iter(refs.values()))) for fileHash, (size, refs) in self.blobRefs.items()}
+
+
+    def evictionCandidates(self, policy, limit):
+        #   Returns up to limit measured items in the order they are evicted
+        items = [item for item in self.itemDict.values() if "Size" in item]
+        if policy == "Largest":
+            return heapq.nlargest(limit, items, key=lambda item: item["Size"])
+
+        return heapq.nsmallest(limit, items, key=getDeletedTime)
+
+
+    def byProject(self, projectName, itemType=None):
+        return [item for item in self.itemDict.values()
+                if item.get("Project") == projectName and (itemType is None or item.get("Type") == itemType)]
+
+
+    def close(self):
+        pass
+
+
+
+class SqliteLedger(object):
+
+    def __init__(self, dbFile):
+        self.dbFile = dbFile
+
+        #   Connection is shared with worker threads
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(dbFile, timeout=10, check_same_thread=False)
+
+        with self.lock, self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS items ("
+                              "uid TEXT PRIMARY KEY, "
+                              "project TEXT, "
+                              "type TEXT, "
+                              "deleted_time REAL, "
+                              "data TEXT)"
+                              )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_items_project ON items (project)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_items_type ON items (type)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_items_deleted ON items (deleted_time)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+            #   Adds the size column to databases created before sizes were recorded
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(items)")]
+            if "size" not in columns:
+                self.conn.execute("ALTER TABLE items ADD COLUMN size INTEGER")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_items_size ON items (size)")
+
+            #   One row per deduplicated file, the hash count is the reference count
+            self.conn.execute("CREATE TABLE IF NOT EXISTS blobs (hash TEXT, uid TEXT, path TEXT, size INTEGER)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_blobs_hash ON blobs (hash)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_blobs_uid ON blobs (uid)")
+
+        #   Changes when another connection commits, such as a delete from a DCC session
+        self.dataVersion = self.getDataVersion()
+
+
+    def makeRow(self, item):
+        return (item["UID"],
+                item.get("Project"),
+                item.get("Type"),
+                getDeletedTime(item),
+                json.dumps(item),
+                item.get("Size")
+                )
+
+
+    def makeBlobRows(self, items):
+        return [(fileHash, item["UID"], os.path.join(item["DeletedLocation"], relPath), size)
+                for item in items
+                for relPath, (fileHash, size) in item.get("Blobs", {}).items()
+                ]
+
+
+    def writeItems(self, items):
+        #   Called inside a transaction
+        self.conn.executemany("INSERT OR REPLACE INTO items (uid, project, type, deleted_time, data, size) VALUES (?, ?, ?, ?, ?, ?)",
+                              [self.makeRow(item) for item in items]
+                              )
+        self.conn.executemany("DELETE FROM blobs WHERE uid = ?", [(item["UID"],) for item in items])
+        self.conn.executemany("INSERT INTO blobs VALUES (?, ?, ?, ?)", self.makeBlobRows(items))
+
+
+    def query(self, sql, args=()):
+        with self.lock:
+            rows = self.conn.execute(sql, args).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
+
+
+    def isMigrated(self):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'migrated'").fetchone()
+
+        return row is not None
+
+
+    def migrate(self, items):
+        #   Imports the existing "Items" array from the settings file
+        with self.lock, self.conn:
+            self.writeItems(items)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('migrated', ?)",
+                              (datetime.now().isoformat(),)
+                              )
+
+        logger.debug(f"Migrated {len(items)} Deleted items to SQLite index.")
+
+
+    def reset(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM items")
+            self.conn.execute("DELETE FROM blobs")
+            self.conn.execute("DELETE FROM meta")
+
+
+    def load(self, snapshotItems, snapshotSignature=None):
+        #   Database is the source of truth, so there is nothing to rebuild
+        pass
+
+
+    def getDataVersion(self):
+        with self.lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+    def sync(self):
+        #   Items changed by other Prism sessions are read from the database when needed, so
+        #   only reports that there were changes.  More than one, so the whole table is reloaded
+        dataVersion = self.getDataVersion()
+        if dataVersion == self.dataVersion:
+            return 0
+
+        self.dataVersion = dataVersion
+        return 2
+
+
+    def rotate(self):
+        pass
+
+
+    def compacted(self, snapshotSignature):
+        pass
+
+
+    def record(self, op, items=None, UIDs=None, allItems=False):
+        with self.lock, self.conn:
+            if op in ["delete", "update"]:
+                self.writeItems(items or [])
+
+            elif op in ["restore", "purge"]:
+                if allItems:
+                    self.conn.execute("DELETE FROM items")
+                    self.conn.execute("DELETE FROM blobs")
+                self.conn.executemany("DELETE FROM items WHERE uid = ?",
+                                      [(UID,) for UID in UIDs or []]
+                                      )
+                self.conn.executemany("DELETE FROM blobs WHERE uid = ?",
+                                      [(UID,) for UID in UIDs or []]
+                                      )
+
+        return 1
+
+
+    def truncate(self):
+        pass
+
+
+    def needsCompaction(self):
+        return False
+
+
+    def items(self):
+        return self.query("SELECT data FROM items ORDER BY deleted_time, rowid")
+
+
+    def get(self, UID):
+        items = self.query("SELECT data FROM items WHERE uid = ?", (UID,))
+        return items[0] if items else None
+
+
+    def expired(self, cutoff):
+        #   Uses the deleted_time index
+        return self.query("SELECT data FROM items WHERE deleted_time < ? ORDER BY deleted_time", (cutoff,))
+
+
+    def evictionCandidates(self, policy, limit):
+        #   Uses the size or deleted_time index
+        if policy == "Largest":
+            return self.query("SELECT data FROM items WHERE size IS NOT NULL ORDER BY size DESC LIMIT ?", (limit,))
+
+        return self.query("SELECT data FROM items WHERE size IS NOT NULL ORDER BY deleted_time LIMIT ?", (limit,))
+
+
+    def totalSize(self):
+        with self.lock:
+            row = self.conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) - COUNT(size) FROM items").fetchone()
+            #   Bytes of files that are hardlinks to another file
+            shared = self.conn.execute("SELECT COALESCE(SUM(size * (refs - 1)), 0) FROM "
+                                       "(SELECT MAX(size) AS size, COUNT(*) AS refs FROM blobs GROUP BY hash)"
+                                       ).fetchone()
+
+        return row[0] - shared[0], row[1]
+
+
+    def blobIndex(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT hash, MAX(size), MIN(path) FROM blobs GROUP BY hash").fetchall()
+
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+
+    def byProject(self, projectName, itemType=None):
+        if itemType is None:
+            return self.query("SELECT data FROM items WHERE project = ? ORDER BY deleted_time", (projectName,))
+
+        return self.query("SELECT data FROM items WHERE project = ? AND type = ? ORDER BY deleted_time",
+                          (projectName, itemType)
+                          )
+
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+
+class MoveEngine(object):
+
+    def __init__(self, maxWorkers=8):
+        #   Number of files copied in parallel when moving to another volume
+        self.maxWorkers = maxWorkers
+
+
+    def getDevice(self, path):
+        #   Uses the nearest existing parent for paths that do not exist yet
+        while not os.path.exists(path):
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+
+        return os.stat(path).st_dev
+
+
+    def isSameDevice(self, source, dest):
+        try:
+            return os.lstat(source).st_dev == self.getDevice(os.path.dirname(dest))
+        except OSError:
+            return False
+
+
+    def move(self, source, dest, progress=None, measure=True):
+        #   Moves source to the dest path.  Dest is the full new path, not the parent Dir.
+        #   Without measure, a rename returns (0, 0) instead of walking the moved tree
+        if os.path.lexists(dest):
+            raise FileExistsError(errno.EEXIST, "Destination already exists", dest)
+
+        #   Same volume is a single rename
+        if self.isSameDevice(source, dest):
+            try:
+                os.rename(source, dest)
+                #   Returns (bytes, number of files) moved
+                return measurePath(dest) if measure else (0, 0)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+
+        logger.debug(f"Moving across volumes: {source}")
+        return self.copyMove(source, dest, progress)
+
+
+    def undoMove(self, source, dest):
+        #   Moves dest back to the source.  Both exist if a copy to another volume was interrupted,
+        #   then files missing from the source are moved back and the rest of dest is removed
+        if not os.path.lexists(dest):
+            return
+
+        if not os.path.lexists(source):
+            os.makedirs(os.path.dirname(source), exist_ok=True)
+            self.move(dest, source, measure=False)
+            return
+
+        if os.path.isdir(dest) and not os.path.islink(dest):
+            for root, dirNames, fileNames in os.walk(dest):
+                sourceRoot = os.path.normpath(os.path.join(source, os.path.relpath(root, dest)))
+                os.makedirs(sourceRoot, exist_ok=True)
+
+                for name in fileNames:
+                    if not os.path.lexists(os.path.join(sourceRoot, name)):
+                        self.move(os.path.join(root, name), os.path.join(sourceRoot, name), measure=False)
+
+            shutil.rmtree(dest)
+        else:
+            os.remove(dest)
+
+
+    def copyMove(self, source, dest, progress=None):
+        fileList = []
+        dirList = []
+
+        if os.path.isdir(source) and not os.path.islink(source):
+            #   Recreates the Dir structure and collects the files to copy
+            for root, dirNames, fileNames in os.walk(source):
+                destRoot = os.path.normpath(os.path.join(dest, os.path.relpath(root, source)))
+                os.makedirs(destRoot, exist_ok=True)
+                dirList.append(root)
+
+                for name in fileNames:
+                    fileList.append((os.path.join(root, name), os.path.join(destRoot, name)))
+
+                #   os.walk does not follow linked Dirs, so they are copied as links
+                for name in dirNames:
+                    if os.path.islink(os.path.join(root, name)):
+                        fileList.append((os.path.join(root, name), os.path.join(destRoot, name)))
+        else:
+            fileList.append((source, dest))
+
+        totalSize = 0
+        try:
+            executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
+            futures = [executor.submit(self.copyFile, src, dst) for src, dst in fileList]
+
+            try:
+                for num, future in enumerate(as_completed(futures)):
+                    totalSize += future.result()
+                    if progress:
+                        progress(num + 1, len(fileList))
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                executor.shutdown(wait=True)
+
+        except Exception:
+            #   Removes the partial copy, the source is untouched
+            if os.path.isdir(dest) and not os.path.islink(dest):
+                shutil.rmtree(dest, ignore_errors=True)
+            elif os.path.lexists(dest):
+                os.remove(dest)
+            raise
+
+        #   Only removes the source once every file has been copied and verified
+        for src, dst in fileList:
+            os.unlink(src)
+
+        for root in reversed(dirList):
+            os.rmdir(root)
+
+        return totalSize, len(fileList)
+
+
+    def copyFile(self, source, dest):
+        shutil.copy2(source, dest, follow_symlinks=False)
+
+        #   Verifies the copy before the source is removed
+        sourceSize = os.lstat(source).st_size
+        destSize = os.lstat(dest).st_size
+        if sourceSize != destSize:
+            raise IOError(f"Size mismatch copying {source} ({sourceSize} / {destSize} bytes)")
+
+        return destSize
+
+
+
+class SceneVersionIndex(object):
+
+    #   Filenames are split into tokens on anything that is not a letter or number
+    tokenPattern = re.compile(r"[^A-Za-z0-9]+")
+
+    def __init__(self, maxDirs=64):
+        self.maxDirs = maxDirs
+        #   Dir path: (mtime_ns, filenames, {token: [filenames]})
+        self.dirCache = {}
+        self.lock = threading.Lock()
+
+
+    def getIndex(self, dirPath):
+        mtime = os.stat(dirPath).st_mtime_ns
+
+        with self.lock:
+            cached = self.dirCache.get(dirPath)
+            if cached and cached[0] == mtime:
+                return cached[1], cached[2]
+
+        #   Sorted so the sidecars of a file can be found by prefix
+        names = sorted(os.listdir(dirPath))
+        index = {}
+        for name in names:
+            for token in set(self.tokenPattern.split(name)):
+                if token:
+                    index.setdefault(token, []).append(name)
+
+        with self.lock:
+            #   Drops the oldest Dir when full
+            if dirPath not in self.dirCache and len(self.dirCache) >= self.maxDirs:
+                self.dirCache.pop(next(iter(self.dirCache)))
+            self.dirCache[dirPath] = (mtime, names, index)
+
+        return names, index
+
+
+    def getFiles(self, dirPath, version):
+        #   Returns the files of a version, so "v001" does not match "v0010"
+        names, index = self.getIndex(dirPath)
+
+        if self.tokenPattern.search(version):
+            #   Version formats containing separators are matched as a substring
+            files = [name for name in names if version in name]
+        else:
+            files = index.get(version, [])
+
+        #   Prism names the sidecars <stem>versioninfo.json and <stem>preview.jpg,
+        #   so files starting with the stem of a matched file are added
+        matched = set(files)
+        for stem in {os.path.splitext(name)[0] for name in files}:
+            for pos in range(bisect.bisect_left(names, stem), len(names)):
+                name = names[pos]
+                if not name.startswith(stem):
+                    break
+                #   "v001" stem does not take "v0010"
+                if not name[len(stem):len(stem) + 1].isdigit():
+                    matched.add(name)
+
+        return self.groupFiles(list(matched))
+
+
+    def groupFiles(self, names):
+        #   Orders each scene file before the sidecars (versioninfo, previews) named after it
+        groups = {}
+        for name in sorted(names, key=len):
+            for base in groups:
+                if name.startswith(os.path.splitext(base)[0]):
+                    groups[base].append(name)
+                    break
+            else:
+                groups[name] = []
+
+        return [file for base in sorted(groups) for file in [base] + sorted(groups[base])]
+
+
+
+class DeleteDirMonitor(object):
+
+    def __init__(self, interval=30, timeout=1.0):
+        self.interval = interval
+        self.timeout = timeout
+        self.path = None
+        self.status = {}
+        self.lock = threading.Lock()
+        #   Set to re-check immediately, and once the current path has been checked
+        self.wake = threading.Event()
+        self.checked = threading.Event()
+        #   Emitted from the monitor thread, delivered on the GUI thread
+        self.signals = WorkerSignals()
+        self.thread = None
+
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="DeleteDirMonitor", daemon=True)
+            self.thread.start()
+
+
+    def setPath(self, path):
+        with self.lock:
+            if path == self.path:
+                return
+            self.path = path
+            self.status = {}
+            self.checked.clear()
+
+        self.wake.set()
+
+
+    def checkPath(self, path):
+        status = {"path": path, "exists": False, "writable": False, "freeSpace": 0}
+        if not path:
+            return status
+
+        try:
+            status["exists"] = os.path.isdir(path)
+            if status["exists"]:
+                status["writable"] = os.access(path, os.W_OK)
+                status["freeSpace"] = shutil.disk_usage(path).free
+        except OSError as e:
+            logger.warning(f"Unable to check Delete Dir: {e}")
+
+        return status
+
+
+    def run(self):
+        while True:
+            self.wake.clear()
+            with self.lock:
+                path = self.path
+
+            status = self.checkPath(path)
+
+            with self.lock:
+                #   Result is discarded if the path was changed during the check
+                if path != self.path:
+                    continue
+                changed = (status["exists"], status["writable"]) != (self.status.get("exists"), self.status.get("writable"))
+                self.status = status
+                self.checked.set()
+
+            if changed:
+                self.signals.result.emit(status)
+
+            self.wake.wait(self.interval)
+
+
+    def getStatus(self):
+        #   Only waits if the current path has not been checked yet
+        self.checked.wait(self.timeout)
+        with self.lock:
+            return dict(self.status)
+
+
+
+class LocationProber(object):
+
+    def __init__(self, timeout=2.0, ttl=30.0):
+        self.timeout = timeout
+        self.ttl = ttl
+        #   Location root: (time checked, reachable)
+        self.rootCache = {}
+        self.lock = threading.Lock()
+
+
+    def probe(self, func, args):
+        #   Runs func for each arg on daemon threads, as a hung network call cannot be
+        #   cancelled.  Returns {arg: result}, with None for probes that timed out
+        results = {}
+
+        def runProbe(arg):
+            try:
+                results[arg] = bool(func(arg))
+            except OSError:
+                results[arg] = False
+
+        threads = []
+        for arg in set(args):
+            thread = threading.Thread(target=runProbe, args=(arg,), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        deadline = time.monotonic() + self.timeout
+        for thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+
+        return {arg: results.get(arg) for arg in args}
+
+
+    def probeRoots(self, roots):
+        #   Returns {root: reachable}, only probing roots not checked within the ttl
+        now = time.monotonic()
+        with self.lock:
+            status = {root: self.rootCache[root][1] for root in roots
+                      if root in self.rootCache and now - self.rootCache[root][0] < self.ttl}
+
+        staleRoots = [root for root in roots if root not in status]
+        if staleRoots:
+            results = self.probe(os.path.isdir, staleRoots)
+            with self.lock:
+                for root in staleRoots:
+                    reachable = bool(results[root])
+                    self.rootCache[root] = (now, reachable)
+                    status[root] = reachable
+
+        return status
+
+
+
+class WorkerSignals(QObject):
+
+    progress = Signal(int, int, str)
+    result = Signal(object)
+    finished = Signal(object)
+    failed = Signal(object)
+
+
+
+class DeleteCancelled(Exception):
+    pass
+
+
+
+class DeleteTransaction(object):
+
+    #   Job keys needed to write the Ledger entry when resuming
+    planKeys = ["projectName", "delItemName", "type", "deletedTime", "UID", "destDir"]
+
+    def __init__(self, txnFile):
+        #   Journal of a single delete - the plan, then a line as each move begins and ends
+        self.txnFile = txnFile
+
+
+    def begin(self, job):
+        os.makedirs(os.path.dirname(self.txnFile), exist_ok=True)
+
+        self.write({"op": "plan",
+                    "host": socket.gethostname(),
+                    "pid": os.getpid(),
+                    "job": {key: job[key] for key in self.planKeys},
+                    "steps": len(job["deleteList"])
+                    })
+
+
+    def write(self, entry):
+        #   Each line is on disk before the next move starts
+        with open(self.txnFile, "a", encoding="utf-8") as txnFile:
+            txnFile.write(json.dumps(entry) + "\n")
+            txnFile.flush()
+            os.fsync(txnFile.fileno())
+
+
+    def read(self):
+        #   Returns the plan, the rebuilt job and the moves that were started
+        with open(self.txnFile, "r", encoding="utf-8") as txnFile:
+            lines = txnFile.read().splitlines()
+
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                #   Last line may be cut short by a crash
+                break
+
+        if not entries or entries[0].get("op") != "plan":
+            raise ValueError("Journal has no plan")
+
+        plan = entries[0]
+        job = dict(plan["job"], origLocList=[], size=0, fileCount=0, volumeDirs=[], txnFile=self.txnFile)
+        #   (source, dest) of every started move, finished or not
+        moves = []
+        for entry in entries[1:]:
+            job["volumeDirs"] = entry["volumeDirs"]
+            if entry["op"] == "begin":
+                moves.append((entry["source"], entry["dest"]))
+            elif entry["op"] == "move":
+                job["origLocList"].append(entry["item"])
+                job["size"] += entry["size"]
+                job["fileCount"] += entry["fileCount"]
+
+        return {"plan": plan, "job": job, "moves": moves}
+
+
+    def remove(self):
+        try:
+            os.remove(self.txnFile)
+        except FileNotFoundError:
+            pass
+
+
+
+class DeleteWorker(QRunnable):
+
+    def __init__(self, job, moveEngine, maxHashWorkers=4, minDedupSize=64 * 1024):
+        super().__init__()
+
+        self.job = job
+        self.moveEngine = moveEngine
+        #   Files are hashed in parallel, hashlib releases the GIL while hashing
+        self.maxHashWorkers = maxHashWorkers
+        #   Smaller files are not worth a hardlink
+        self.minDedupSize = minDedupSize
+        self.cancelEvent = threading.Event()
+        self.signals = WorkerSignals()
+        #   Reference is held by the plugin until the worker reports back
+        self.setAutoDelete(False)
+
+
+    def cancel(self):
+        #   Called from the GUI thread.  Stops before the next item, or the next copied file
+        self.cancelEvent.set()
+
+
+    def getTrashDir(self, job, sourceItem):
+        #   Returns the item Dir to move the source to - in the Delete Dir, or in the
+        #   trash root on the same volume as the source so the move is a rename
+        destDir = job["destDir"]
+        if not job.get("trashRoots"):
+            return destDir
+
+        try:
+            sourceDevice = os.lstat(sourceItem).st_dev
+            if sourceDevice == self.moveEngine.getDevice(destDir):
+                return destDir
+
+            for root in job["trashRoots"]:
+                if self.moveEngine.getDevice(root) != sourceDevice:
+                    continue
+
+                #   Reuses the Dir this job already made in the root
+                rootKey = TrashScanner.getKey(root)
+                for volumeDir in job["volumeDirs"]:
+                    if TrashScanner.getKey(os.path.dirname(volumeDir)) == rootKey:
+                        return volumeDir
+
+                volumeDir = self.makeVolumeDir(root, f"{os.path.basename(destDir)}_{job['UID']}")
+                job["volumeDirs"].append(volumeDir)
+                return volumeDir
+
+        except OSError as e:
+            logger.warning(f"Unable to use a trash root for {sourceItem}: {e}")
+
+        return destDir
+
+
+    def makeVolumeDir(self, root, dirName):
+        #   Trash roots are shared by every workstation, so an existing Dir is never reused.
+        #   Creates the Dir with an exclusive mkdir, and will append _# if the name is taken
+        os.makedirs(root, exist_ok=True)
+
+        volumeDir = os.path.join(root, dirName)
+        newSuffix = 0
+        while True:
+            try:
+                os.mkdir(volumeDir)
+                return volumeDir
+            except FileExistsError:
+                newSuffix += 1
+                volumeDir = os.path.join(root, f"{dirName}_{newSuffix}")
+
+
+    def moveItems(self, job, reportProgress=True):
+        if self.cancelEvent.is_set():
+            raise DeleteCancelled("Delete was cancelled")
+
+        #   The plan is journaled first, so an interrupted delete can be rolled back
+        txn = DeleteTransaction(job["txnFile"])
+        txn.begin(job)
+        job["moves"] = []
+
+        try:
+            self.transactMoves(job, txn, reportProgress)
+        except Exception:
+            self.rollback(job, txn)
+            raise
+
+
+    def rollback(self, job, txn):
+        #   Moves the items back in reverse order.  Items that cannot be moved back stay
+        #   in the job, and are recorded in the Ledger
+        for num in reversed(range(len(job["moves"]))):
+            sourceItem, destItem, itemSize, fileCount = job["moves"][num]
+            try:
+                self.moveEngine.undoMove(sourceItem, destItem)
+            except Exception as e:
+                logger.warning(f"ERROR: Unable to roll back {destItem}:  {e}")
+                continue
+
+            del job["moves"][num]
+            del job["origLocList"][num]
+            job["size"] -= itemSize
+            job["fileCount"] -= fileCount
+
+        if not job["origLocList"]:
+            txn.remove()
+
+
+    def transactMoves(self, job, txn, reportProgress):
+        destDir = job["destDir"]
+        deleteList = job["deleteList"]
+
+        for num, item in enumerate(deleteList):
+            if self.cancelEvent.is_set():
+                raise DeleteCancelled("Delete was cancelled")
+
+            sourceItem = item["path"]
+            trashDir = self.getTrashDir(job, sourceItem)
+            destItem = os.path.join(trashDir, item["location"])
+            itemName = os.path.basename(sourceItem)
+
+            #   Locations moved to another trash root record where they are
+            if trashDir != destDir:
+                item = dict(item, trashPath=destItem)
+
+            if reportProgress:
+                self.signals.progress.emit(num, len(deleteList), f"Deleting {itemName}..")
+
+            #   For cases that just delete files in a Dir
+            if job["type"] in ["Scene Files", "Library Item"]:
+                if not os.path.exists(destItem):
+                    os.mkdir(destItem)
+                destItem = os.path.join(destItem, itemName)
+
+            #   Reports file progress when copying to another volume.  The partial copy
+            #   is removed by the MoveEngine if cancelled
+            def copyProgress(copied, total):
+                if self.cancelEvent.is_set():
+                    raise DeleteCancelled("Delete was cancelled")
+                if reportProgress:
+                    self.signals.progress.emit(copied, total, f"Copying {itemName} to Delete Dir..")
+
+            txn.write({"op": "begin",
+                       "source": sourceItem,
+                       "dest": destItem,
+                       "volumeDirs": job["volumeDirs"]
+                       })
+
+            itemSize, fileCount = self.moveEngine.move(sourceItem, destItem, progress=copyProgress)
+
+            job["origLocList"].append(item)
+            job["moves"].append((sourceItem, destItem, itemSize, fileCount))
+            job["size"] += itemSize
+            job["fileCount"] += fileCount
+
+            txn.write({"op": "move",
+                       "item": item,
+                       "source": sourceItem,
+                       "dest": destItem,
+                       "size": itemSize,
+                       "fileCount": fileCount,
+                       "volumeDirs": job["volumeDirs"]
+                       })
+
+
+    def dedupItems(self, job):
+        #   Replaces files that are already in the Delete Dir with hardlinks
+        blobIndex = job["blobIndex"]
+        destDir = job["destDir"]
+
+        files = []
+        for root, dirs, names in os.walk(destDir):
+            for name in names:
+                path = os.path.join(root, name)
+                size = os.lstat(path).st_size
+                if size >= self.minDedupSize and not os.path.islink(path):
+                    files.append((path, size))
+
+        job["blobs"] = {}
+        job["dedupSize"] = 0
+
+        with ThreadPoolExecutor(max_workers=self.maxHashWorkers) as executor:
+            futures = {executor.submit(hashFile, path): (path, size) for path, size in files}
+
+            for future in as_completed(futures):
+                path, size = futures[future]
+                try:
+                    fileHash = future.result()
+                except OSError as e:
+                    logger.warning(f"Unable to hash {path}: {e}")
+                    continue
+
+                #   Only files that share their data are recorded, as the Ledger counts each
+                #   reference after the first as freed space.  A file that cannot be linked
+                #   keeps its own copy, and is left out
+                existing = blobIndex.get(fileHash)
+                if not existing or existing[0] != size:
+                    blobIndex[fileHash] = (size, path)
+                elif linkFile(existing[1], path):
+                    job["dedupSize"] += size
+                else:
+                    continue
+
+                job["blobs"][os.path.relpath(path, destDir)] = [fileHash, size]
+
+
+    def run(self):
+        job = self.job
+        deleteList = job["deleteList"]
+
+        try:
+            self.moveItems(job)
+
+            if job.get("blobIndex") is not None:
+                self.signals.progress.emit(len(deleteList), len(deleteList), "Deduplicating files..")
+                try:
+                    self.dedupItems(job)
+                except OSError as e:
+                    logger.warning(f"Unable to deduplicate {job['delItemName']}: {e}")
+
+            self.signals.progress.emit(len(deleteList), len(deleteList), "")
+            self.signals.finished.emit(job)
+
+        except Exception as e:
+            job["error"] = e
+            self.signals.failed.emit(job)
+
+
+
+class BatchDeleteWorker(DeleteWorker):
+
+    def __init__(self, job, moveEngine, maxWorkers=4):
+        super().__init__(job, moveEngine)
+
+        self.maxWorkers = maxWorkers
+
+
+    def run(self):
+        batch = self.job
+        jobs = batch["jobs"]
+
+        try:
+            #   Each item has its own Delete Dir, so the items are moved concurrently
+            with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+                futures = {executor.submit(self.moveItems, job, False): job for job in jobs}
+
+                for num, future in enumerate(as_completed(futures), 1):
+                    job = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        job["error"] = e
+                        batch["failures"].append(job)
+
+                    self.signals.progress.emit(num, len(jobs), f"Deleted {job['delItemName']}..")
+
+            #   Deduplicated one item at a time, as the items share the blob index
+            for num, job in enumerate(jobs, 1):
+                if "error" in job or job.get("blobIndex") is None:
+                    continue
+
+                self.signals.progress.emit(num, len(jobs), f"Deduplicating {job['delItemName']}..")
+                try:
+                    self.dedupItems(job)
+                except OSError as e:
+                    logger.warning(f"Unable to deduplicate {job['delItemName']}: {e}")
+
+            self.signals.finished.emit(batch)
+
+        except Exception as e:
+            batch["error"] = e
+            self.signals.failed.emit(batch)
+
+
+
+class RollbackWorker(QRunnable):
+
+    def __init__(self, job, moveEngine):
+        super().__init__()
+
+        self.job = job
+        self.moveEngine = moveEngine
+        self.signals = WorkerSignals()
+        self.setAutoDelete(False)
+
+
+    def rollbackRecord(self, record):
+        job = record["job"]
+
+        #   Moves everything back in reverse order, including a move that was interrupted
+        for sourceItem, destItem in reversed(record["moves"]):
+            self.moveEngine.undoMove(sourceItem, destItem)
+
+        for path in [job["destDir"]] + job["volumeDirs"]:
+            shutil.rmtree(path, ignore_errors=True)
+
+        DeleteTransaction(job["txnFile"]).remove()
+
+
+    def run(self):
+        job = self.job
+        records = job["records"]
+        job["rolledBack"] = []
+        job["failures"] = []
+
+        try:
+            for num, record in enumerate(records, 1):
+                delItemName = record["job"]["delItemName"]
+                try:
+                    self.rollbackRecord(record)
+                    job["rolledBack"].append(delItemName)
+                except Exception as e:
+                    job["failures"].append((delItemName, str(e)))
+
+                self.signals.progress.emit(num, len(records), f"Rolled back {delItemName}")
+
+            self.signals.finished.emit(job)
+
+        except Exception as e:
+            job["error"] = e
+            self.signals.failed.emit(job)
+
+
+
+class RestoreWorker(QRunnable):
+
+    def __init__(self, job, moveEngine, maxWorkers=4):
+        super().__init__()
+
+        self.job = job
+        self.moveEngine = moveEngine
+        self.maxWorkers = maxWorkers
+        self.signals = WorkerSignals()
+        self.setAutoDelete(False)
+
+
+    def getRestoreDir(self, restoreEntity, origItem):
+        #   For case where restoring files to a Dir, else restores the entire Dir
+        if restoreEntity["Type"] in ["Scene Files", "Library Item"]:
+            return os.path.dirname(origItem["path"])
+        else:
+            return origItem["path"]
+
+
+    def getMoves(self, restoreEntity):
+        #   Returns the (Delete Dir path, original path) pairs for an item
+        moves = []
+        #   Scene Files list each file with the same location Dir, so each Dir is only listed once
+        listedDirs = set()
+        for origItem in restoreEntity["OriginalLocation"]:
+            delLocation = getLocationDir(restoreEntity, origItem)
+            restoreDir = self.getRestoreDir(restoreEntity, origItem)
+
+            key = TrashScanner.getKey(delLocation)
+            if key in listedDirs:
+                continue
+            listedDirs.add(key)
+
+            for item in os.listdir(delLocation):
+                moves.append((os.path.join(delLocation, item), os.path.join(restoreDir, item)))
+
+        return moves
+
+
+    def getManifest(self, restoreEntity):
+        #   Returns {location: [top-level names]} of an archived item
+        manifest = restoreEntity.get("Manifest")
+        if isinstance(manifest, dict):
+            return manifest
+
+        #   Items archived with a per-file manifest, or without one
+        if manifest is not None:
+            names = [name for name, size in manifest]
+        else:
+            readMode = ArchiveWorker.formats[restoreEntity["ArchiveFormat"]][1]
+            with tarfile.open(restoreEntity["Archive"], readMode) as archive:
+                names = [member.name for member in archive]
+
+        manifest = {}
+        for name in names:
+            parts = name.split("/")
+            if len(parts) > 1 and parts[1] not in manifest.setdefault(parts[0], []):
+                manifest[parts[0]].append(parts[1])
+
+        return manifest
+
+
+    def extractItem(self, restoreEntity):
+        #   Streams an archived item straight back to the original locations
+        restoreDirs = {origItem["location"]: self.getRestoreDir(restoreEntity, origItem)
+                       for origItem in restoreEntity["OriginalLocation"]}
+
+        def getDest(name):
+            parts = name.split("/")
+            if parts[0] not in restoreDirs or ".." in parts or os.path.isabs(name):
+                raise ValueError(f"Unexpected archive member: {name}")
+            return os.path.join(restoreDirs[parts[0]], *parts[1:])
+
+        readMode = ArchiveWorker.formats[restoreEntity["ArchiveFormat"]][1]
+
+        #   Conflicts are checked from the manifest, before the archive is read
+        conflicts = sorted({name for locName, names in self.getManifest(restoreEntity).items()
+                            for name in names if os.path.lexists(getDest(f"{locName}/{name}"))})
+        if conflicts:
+            return conflicts
+
+        extracted = {}
+        createdDirs = []
+        try:
+            with tarfile.open(restoreEntity["Archive"], readMode) as archive:
+                for member in archive:
+                    dest = getDest(member.name)
+
+                    if member.isdir():
+                        if not os.path.isdir(dest):
+                            os.makedirs(dest)
+                            createdDirs.append(dest)
+                        continue
+
+                    if not os.path.isdir(os.path.dirname(dest)):
+                        os.makedirs(os.path.dirname(dest))
+                        createdDirs.append(os.path.dirname(dest))
+
+                    if member.isfile():
+                        with archive.extractfile(member) as source, open(dest, "xb") as target:
+                            extracted[member.name] = dest
+                            shutil.copyfileobj(source, target, 1024 * 1024)
+                        os.utime(dest, (member.mtime, member.mtime))
+
+                    elif member.issym():
+                        os.symlink(member.linkname, dest)
+                        extracted[member.name] = dest
+
+                    #   Files that were hardlinked when archived are restored as copies
+                    elif member.islnk() and member.linkname in extracted:
+                        shutil.copy2(extracted[member.linkname], dest)
+                        extracted[member.name] = dest
+
+                    else:
+                        raise ValueError(f"Unable to restore archive member: {member.name}")
+
+        #   Archive is the only copy, so it is kept and the partial restore is removed
+        except Exception:
+            for dest in extracted.values():
+                if os.path.lexists(dest):
+                    os.remove(dest)
+            for path in reversed(createdDirs):
+                shutil.rmtree(path, ignore_errors=True)
+            raise
+
+        os.remove(restoreEntity["Archive"])
+
+        return []
+
+
+    def restoreItem(self, restoreEntity):
+        if restoreEntity.get("Archive"):
+            return self.extractItem(restoreEntity)
+
+        moves = self.getMoves(restoreEntity)
+
+        #   All conflicts are checked before anything is moved, so an item is never half restored
+        conflicts = [os.path.basename(origItemPath) for delItemPath, origItemPath in moves
+                     if os.path.exists(origItemPath)]
+        if conflicts:
+            return conflicts
+
+        for delItemPath, origItemPath in moves:
+            os.makedirs(os.path.dirname(origItemPath), exist_ok=True)
+            #   Sizes are only recorded for deletes
+            self.moveEngine.move(delItemPath, origItemPath, measure=False)
+
+        #   Deduplicated files may still be linked to another item in the Delete Dir
+        if restoreEntity.get("Blobs"):
+            for delItemPath, origItemPath in moves:
+                if os.path.isdir(origItemPath):
+                    for root, dirs, names in os.walk(origItemPath):
+                        for name in names:
+                            breakHardlink(os.path.join(root, name))
+                else:
+                    breakHardlink(origItemPath)
+
+        for delLocBase in getItemPaths(restoreEntity):
+            if os.path.exists(delLocBase):
+                shutil.rmtree(delLocBase)
+
+        return []
+
+
+    def run(self):
+        job = self.job
+        items = job["items"]
+
+        job["restoredUIDs"] = []
+        job["conflicts"] = []
+        job["failures"] = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+                futures = {executor.submit(self.restoreItem, item): item for item in items}
+
+                for num, future in enumerate(as_completed(futures), 1):
+                    item = futures[future]
+                    try:
+                        conflicts = future.result()
+                        if conflicts:
+                            job["conflicts"].append((item["Entity"], conflicts))
+                        else:
+                            job["restoredUIDs"].append(item["UID"])
+                    except Exception as e:
+                        job["failures"].append((item["Entity"], str(e)))
+
+                    self.signals.progress.emit(num, len(items), f"Restored {item['Entity']}..")
+
+            self.signals.finished.emit(job)
+
+        except Exception as e:
+            job["error"] = e
+            self.signals.failed.emit(job)
+
+
+
+class ArchiveWorker(QRunnable):
+
+    #   Compression name: (tarfile write mode, tarfile stream read mode, extension)
+    formats = {"gzip": ("w:gz", "r|gz", ".tar.gz"),
+               "xz": ("w:xz", "r|xz", ".tar.xz")
+               }
+
+    def __init__(self, job, maxWorkers=2):
+        super().__init__()
+
+        self.job = job
+        #   zlib and lzma release the GIL while compressing
+        self.maxWorkers = maxWorkers
+        self.signals = WorkerSignals()
+        self.setAutoDelete(False)
+
+
+    @classmethod
+    def getArchivePath(cls, item, archiveFormat):
+        #   Item Dir name is free again once archived, so the UID keeps a later item
+        #   with the same name from replacing this archive
+        itemDir = os.path.normpath(item["DeletedLocation"])
+        return f"{itemDir}_{item['UID']}{cls.formats[archiveFormat][2]}"
+
+
+    def archiveItem(self, item, archiveFormat):
+        writeMode, readMode, extension = self.formats[archiveFormat]
+        itemDir = os.path.normpath(item["DeletedLocation"])
+        archivePath = self.getArchivePath(item, archiveFormat)
+        if os.path.lexists(archivePath):
+            raise FileExistsError(errno.EEXIST, "Archive already exists", archivePath)
+        tmpPath = archivePath + ".tmp"
+
+        #   Member names are relative to the item Dir, starting with the location name
+        #   Manifest only lists the top-level names of each location, for the restore conflict check
+        manifest = {}
+        fileCount = 0
+        with tarfile.open(tmpPath, writeMode) as archive:
+            for root, dirs, names in os.walk(itemDir):
+                dirs.sort()
+                for name in dirs + sorted(names):
+                    path = os.path.join(root, name)
+                    arcName = os.path.relpath(path, itemDir).replace(os.sep, "/")
+                    archive.add(path, arcname=arcName, recursive=False)
+                    if name in names:
+                        fileCount += 1
+
+                    parts = arcName.split("/")
+                    if len(parts) == 1:
+                        manifest.setdefault(name, [])
+                    elif len(parts) == 2:
+                        manifest.setdefault(parts[0], []).append(name)
+
+        #   Item Dir is only removed once the archive is complete
+        if os.path.lexists(archivePath):
+            os.remove(tmpPath)
+            raise FileExistsError(errno.EEXIST, "Archive already exists", archivePath)
+        os.replace(tmpPath, archivePath)
+        shutil.rmtree(itemDir)
+
+        archivedItem = dict(item)
+        #   Archived files no longer share data with other items
+        archivedItem.pop("Blobs", None)
+        archivedItem["Archive"] = archivePath
+        archivedItem["ArchiveFormat"] = archiveFormat
+        archivedItem["Manifest"] = manifest
+        archivedItem["FileCount"] = fileCount
+        archivedItem["OriginalSize"] = item.get("Size")
+        archivedItem["Size"] = os.path.getsize(archivePath)
+
+        return archivedItem
+
+
+    def run(self):
+        job = self.job
+        items = job["items"]
+        job["archivedItems"] = []
+        job["failures"] = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+                futures = {executor.submit(self.archiveItem, item, job["format"]): item for item in items}
+
+                for num, future in enumerate(as_completed(futures), 1):
+                    item = futures[future]
+                    try:
+                        job["archivedItems"].append(future.result())
+                    except Exception as e:
+                        job["failures"].append((item["Entity"], str(e)))
+
+                    self.signals.progress.emit(num, len(items), f"Archived {item['Entity']}")
+
+            self.signals.finished.emit(job)
+
+        except Exception as e:
+            job["error"] = e
+            self.signals.failed.emit(job)
+
+
+
+class TrashScanner(QRunnable):
+
+    def __init__(self, job, scanCache):
+        super().__init__()
+
+        self.job = job
+        #   {itemPath: (signature, bytes, number of files)} - shared between scans
+        self.scanCache = scanCache
+        self.signals = WorkerSignals()
+        self.setAutoDelete(False)
+
+
+    @staticmethod
+    def getKey(path):
+        return os.path.normcase(os.path.normpath(path))
+
+
+    def getSignature(self, entry):
+        #   mtime of the item Dir and of each of its direct children (the location Dirs)
+        signature = [("", entry.stat(follow_symlinks=False).st_mtime_ns)]
+
+        if entry.is_dir(follow_symlinks=False):
+            with os.scandir(entry.path) as children:
+                for child in children:
+                    signature.append((child.name, child.stat(follow_symlinks=False).st_mtime_ns))
+
+        return tuple(sorted(signature))
+
+
+    def run(self):
+        job = self.job
+        results = {}
+        partialTotal = 0
+
+        try:
+            with os.scandir(job["delDirectory"]) as entries:
+                itemEntries = list(entries)
+
+            #   Trash roots of other volumes may not have been made yet, or be offline
+            for root in job.get("trashRoots", []):
+                try:
+                    with os.scandir(root) as entries:
+                        itemEntries += list(entries)
+                except OSError:
+                    continue
+
+            for num, entry in enumerate(itemEntries):
+                key = self.getKey(entry.path)
+
+                try:
+                    signature = self.getSignature(entry)
+                except OSError:
+                    continue
+
+                #   Only re-measures items that changed since the last scan
+                cached = self.scanCache.get(key)
+                if cached and cached[0] == signature:
+                    itemSize, fileCount = cached[1], cached[2]
+                else:
+                    itemSize, fileCount = measurePath(entry.path)
+                    self.scanCache[key] = (signature, itemSize, fileCount)
+
+                results[key] = (itemSize, fileCount)
+                partialTotal += itemSize
+
+                self.signals.progress.emit(num + 1, len(itemEntries), entry.name)
+                self.signals.result.emit(partialTotal)
+
+            #   Drops cache entries of items that are gone
+            for key in list(self.scanCache):
+                if key not in results:
+                    del self.scanCache[key]
+
+            job["results"] = results
+            self.signals.finished.emit(job)
+
+        except Exception as e:
+            job["error"] = e
+            self.signals.failed.emit(job)
+
+
+
+class PurgeWorker(QRunnable):
+
+    def __init__(self, job, maxWorkers=4):
+        super().__init__()
+
+        self.job = job
+        #   Number of items removed at the same time
+        self.maxWorkers = maxWorkers
+        self.signals = WorkerSignals()
+        self.setAutoDelete(False)
+
+
+    def removePath(self, path):
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        elif os.path.lexists(path):
+            os.remove(path)
+
+
+    def run(self):
+        job = self.job
+        targets = list(job["targets"])
+        job["purgedUIDs"] = []
+        job["failures"] = []
+
+        try:
+            #   Purge All also removes anything in the Delete Dir that is not in the Ledger
+            if job["allItems"]:
+                knownPaths = {TrashScanner.getKey(path) for path, UID in targets}
+                #   Dirs of items that are still being worked on
+                knownPaths.update(TrashScanner.getKey(path) for path in job["keepPaths"])
+                with os.scandir(job["delDirectory"]) as entries:
+                    for entry in entries:
+                        if TrashScanner.getKey(entry.path) not in knownPaths:
+                            targets.append((entry.path, None))
+
+                #   Trash roots of other volumes are shared with other workstations and
+                #   sessions, so only the VolumeDirs recorded in the Ledger are purged there
+
+            #   Items with Dirs on several volumes are only purged once all of them are removed
+            failedUIDs = set()
+            with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+                futures = {executor.submit(self.removePath, path): (path, UID) for path, UID in targets}
+
+                for num, future in enumerate(as_completed(futures)):
+                    path, UID = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        job["failures"].append((path, UID, str(e)))
+                        failedUIDs.add(UID)
+
+                    self.signals.progress.emit(num + 1, len(targets), f"Purged {os.path.basename(path)}")
+
+            job["purgedUIDs"] = [UID for UID in dict.fromkeys(UID for path, UID in targets)
+                                 if UID and UID not in failedUIDs]
+
+            self.signals.finished.emit(job)
+
+        except Exception as e:
+            job["error"] = e
+            self.signals.failed.emit(job)
+
+
+
+class AutoPurger(object):
+
+    def __init__(self, core, plugin):
+        super().__init__()
+
+        self.core = core
+        self.plugin = plugin
+
+        #   Single-shot timer armed for the next item to expire
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.checkDir)
+
+        #   Longest time between checks, so items deleted in other Prism sessions are picked up.
+        #   Idle checks only stat the settings files.
+        self.maxCheckInterval = 3600  # seconds  (1 hour)
+        #   Delay before retrying items that could not be purged
+        self.retryInterval = 600  # seconds  (10 mins)
+
+        self.deleteInterval = 0
+        #   Min-heap of (deleted time, UID)
+        self.expiryHeap = []
+
+        #   Stops timer thread when Prism is quitting
+        QCoreApplication.instance().aboutToQuit.connect(self.stop)
+
+
+    def rebuild(self):
+        #   Rebuilds the expiry index from the Ledger
+        self.expiryHeap = [(getDeletedTime(item), item["UID"]) for item in self.plugin.ledger.items()]
+        heapq.heapify(self.expiryHeap)
+
+        self.schedule()
+
+
+    def addItems(self, items):
+        for item in items:
+            heapq.heappush(self.expiryHeap, (getDeletedTime(item), item["UID"]))
+
+        self.schedule()
+
+
+    def schedule(self):
+        #   Arms the timer for the next item to expire, or for the next archive check
+        if self.deleteInterval <= 0 and self.plugin.archiveAfter <= 0:
+            self.timer.stop()
+            return
+
+        wait = self.maxCheckInterval
+        if self.deleteInterval > 0 and self.expiryHeap:
+            nextExpiry = self.expiryHeap[0][0] + self.deleteInterval * 3600
+            wait = min(wait, max(0, nextExpiry - time.time()))
+
+        logger.debug(f"Next AutoPurge check in {round(wait / 60, 1)} mins.")
+        self.timer.start(int(wait * 1000))  # Convert seconds to milliseconds
+
+
+    def checkDir(self):
+        #   Picks up items deleted in other Prism sessions
+        self.plugin.syncSettings()
+
+        if self.deleteInterval <= 0:
+            self.plugin.archiveAged()
+            self.schedule()
+            return
+
+        #   Calculates cutoff time based on interval and present time
+        delTimeCutoff = self.getDelTimeCutoff()
+        cutoff = delTimeCutoff.timestamp()
+
+        #   Items restored or purged since they were added are removed from the Ledger,
+        #   so stale heap entries are only dropped here
+        isDue = False
+        while self.expiryHeap and self.expiryHeap[0][0] < cutoff:
+            heapq.heappop(self.expiryHeap)
+            isDue = True
+
+        if isDue:
+            logger.info(f"AutoPurge--Checking directory: {self.plugin.delDirectory}")
+            logger.debug(f"Files older than {delTimeCutoff.isoformat(sep=' ', timespec='seconds')} will be purged.")
+
+            #   Deletes the deleted files
+            self.executePurge(delTimeCutoff)
+
+        self.plugin.archiveAged()
+        self.schedule()
+
+
+    def getDelTimeCutoff(self):
+        #   Returns the date/time based on the hours interval selected in the menu
+        currentDateTime = datetime.now()
+        delTimeCutoff = currentDateTime - timedelta(hours=self.deleteInterval)
+
+        return delTimeCutoff
+
+
+    def executePurge(self, delTimeCutoff):
+        #   Gets the items deleted before the cutoff from the Ledger
+        itemsToDelete = self.plugin.ledger.expired(delTimeCutoff.timestamp())
+
+        #   Purged on the thread pool, and recorded in the Ledger once for the batch
+        if itemsToDelete:
+            logger.debug(f"Purging {len(itemsToDelete)} expired items")
+            skippedUIDs = self.plugin.startPurge(itemsToDelete, showProgress=False, auto=True)
+
+            #   Items that are being restored or archived were popped from the heap, so they
+            #   are retried if they are still in the Ledger
+            if skippedUIDs:
+                self.requeue(skippedUIDs)
+
+
+    def requeue(self, UIDs):
+        #   Items that could not be purged are retried after the retry interval
+        retryTime = time.time() - self.deleteInterval * 3600 + self.retryInterval
+        for UID in UIDs:
+            heapq.heappush(self.expiryHeap, (retryTime, UID))
 
-        # Save the updated data back to the settings file
-        data["Items"] = itemsList
-        with open(self.settingsFile, 'w') as file:
-            json.dump(data, file, indent=4)
+        self.schedule()
 
 
     def run(self, interval):
@@ -1569,7 +4956,7 @@ class AutoPurger(object):
         logger.info(f"AutoPurge Interval: {interval}")
         logger.info(f"Deleted files older than {interval}hrs will be purged")
 
-        self.checkDir()
+        self.rebuild()
 
 
     def isRunning(self):
@@ -1577,4 +4964,6 @@ class AutoPurger(object):
 
 
     def stop(self):
+        #   Also keeps new deletes from re-arming the timer until run() is called
+        self.deleteInterval = 0
         self.timer.stop()